@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures
+"""
+import os
+
+import orjson
+import pytest
+
+import jmcp
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze time.monotonic; advance it with clock.now += seconds"""
+    clock = Clock()
+    monkeypatch.setattr(jmcp.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def write_tokens(tmp_path, monkeypatch):
+    """Return a writer for .tokens in a fresh working directory, with the token index unloaded"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(jmcp, "_TOKENS_MTIME", -1)
+    monkeypatch.setattr(jmcp, "_TOKENS_CHECKED_AT", float("-inf"))
+
+    def write(tokens):
+        with open(".tokens", "wb") as f:
+            f.write(orjson.dumps(tokens))
+        # Move the mtime forward so the change is seen even within the timestamp granularity
+        st = os.stat(".tokens")
+        os.utime(".tokens", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    return write
@@ -20,20 +20,38 @@
 from __future__ import annotations as _annotations
 
 import argparse
+import asyncio
+import atexit
+import copy
+import functools
+import hashlib
+import io
+import ipaddress
+import importlib.util
 import time
-from datetime import datetime, timezone
+import warnings
+from datetime import datetime, timedelta, timezone
 import logging
+import mmap
 import os
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
-import json
+from jinja2 import Environment, FileSystemLoader, TemplateError, TemplateNotFound
+import jsonschema
+import orjson
 import yaml
+try:
+    # LibYAML C bindings parse an order of magnitude faster than the pure-Python loader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 import sys
 import signal
+import stat
+from collections import OrderedDict
 from typing import Any, Sequence
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
 
-from typing import Dict, Any, Generic, Literal
-from pydantic import BaseModel, Field
+from typing import Annotated, Dict, Any, Generic, List, Literal
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
 from pydantic.networks import AnyUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -44,15 +62,15 @@ from mcp.server.elicitation import (
 )
 
 import anyio
+import uvicorn
 import mcp.types as types
 from mcp.server.lowlevel import Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
 from starlette.routing import Mount
 from starlette.middleware import Middleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from mcp.server.session import ServerSession, ServerSessionT
 from mcp.server.elicitation import ElicitationResult, ElicitSchemaModelT, elicit_with_validation
@@ -79,21 +97,104 @@ from mcp.types import Tool as MCPTool
 from jnpr.junos import Device
 from jnpr.junos.exception import ConnectError
 from jnpr.junos.utils.config import Config
+from lxml import etree
 
-from utils.config import prepare_connection_params, validate_device_config, validate_all_devices
+from utils.config import intern_device_names, prepare_connection_params, validate_device_config, validate_all_devices
+from utils.device_pool import DevicePool
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 log = logging.getLogger('jmcp-server')
 
+# ncclient and paramiko log every RPC and SSH event at INFO/DEBUG; keep them to warnings so
+# concurrent sessions don't spend time formatting records nobody reads
+for _noisy_logger in ('ncclient', 'paramiko'):
+    logging.getLogger(_noisy_logger).setLevel(logging.WARNING)
+warnings.filterwarnings("ignore", category=DeprecationWarning, module=r"jnpr\.junos")
+
+# Large debug payloads (parsed variables, rendered configs) are only sent to MCP clients
+# when JMCP_DEBUG=1, so they are not formatted on every call
+_CLIENT_DEBUG = os.getenv('JMCP_DEBUG') == '1'
+
 # Global variable for devices (parsed from JSON file)
 devices = {}
 
+# Persistent NETCONF sessions, one per router, closed after 5 minutes idle
+device_pool = DevicePool(idle_timeout=300)
+atexit.register(device_pool.close_all)
+
 # Junos MCP Server
 JUNOS_MCP = 'jmcp-server'
 
+# Shared Jinja2 environment for configuration templates, built once at import
+JINJA_ENV = Environment(
+    trim_blocks=True,
+    lstrip_blocks=True,
+    autoescape=False,
+    cache_size=400,
+    auto_reload=False
+)
+
+
+# Maximum number of routers a template is applied to concurrently
+_APPLY_CONCURRENCY = 16
+
+# Maximum number of routers queried concurrently by the bulk tools (keep below sshd MaxStartups)
+_BULK_CONCURRENCY = 32
+
+# Worker threads reserved for blocking PyEZ calls. These are network-bound, so they get their
+# own limiter instead of competing for anyio's default pool of 40 threads.
+_PYEZ_THREADS = 128
+_pyez_limiter: anyio.CapacityLimiter | None = None
+
+
+# One asyncio lock per router. PyEZ sessions are used by one thread at a time anyway (see
+# DevicePool), so calls for the same router queue here instead of parking worker threads.
+_ROUTER_LOCKS: Dict[str, asyncio.Lock] = {}
+
+
+async def _run_pyez(router_name: str, func, *args):
+    """Run a blocking PyEZ helper for router_name in a worker thread bounded by the PyEZ limiter"""
+    global _pyez_limiter
+    if _pyez_limiter is None:
+        # Created lazily because a CapacityLimiter is bound to the running event loop
+        _pyez_limiter = anyio.CapacityLimiter(_PYEZ_THREADS)
+    lock = _ROUTER_LOCKS.get(router_name)
+    if lock is None:
+        lock = _ROUTER_LOCKS[router_name] = asyncio.Lock()
+    async with lock:
+        return await anyio.to_thread.run_sync(func, *args, limiter=_pyez_limiter)
+
+# Parsed template variables keyed by a digest of the YAML source (LRU, see _parse_vars)
+_VARS_CACHE: OrderedDict[bytes, Any] = OrderedDict()
+_VARS_CACHE_SIZE = 128
+
 
-class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
+def _parse_vars(vars_content: str) -> Any:
+    """Parse YAML variables, reusing the parse for previously seen content
+    
+    Templates run in a regular (non-sandboxed) environment and can mutate what they
+    are given ({% do %}, .update(), .append()), so each caller gets its own deep copy.
+    """
+    digest = hashlib.blake2b(vars_content.encode(), digest_size=16).digest()
+    variables = _VARS_CACHE.get(digest)
+    if variables is not None:
+        _VARS_CACHE.move_to_end(digest)
+    else:
+        variables = yaml.load(vars_content, Loader=_SafeLoader)
+        _VARS_CACHE[digest] = variables
+        if len(_VARS_CACHE) > _VARS_CACHE_SIZE:
+            _VARS_CACHE.popitem(last=False)
+    return copy.deepcopy(variables)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(template_content: str):
+    """Compile template source once; repeated calls with the same source reuse the Template"""
+    return JINJA_ENV.from_string(template_content)
+
+
+class Context(Generic[ServerSessionT, LifespanContextT, RequestT]):
     """Context object providing access to MCP capabilities.
 
     This provides a cleaner interface to MCP's RequestContext functionality.
@@ -127,6 +228,8 @@ class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
     The context is optional - tools that don't need it can omit the parameter.
     """
 
+    __slots__ = ("_request_context", "_fastmcp")
+
     _request_context: RequestContext[ServerSessionT, LifespanContextT, RequestT] | None
     _fastmcp: Server | None
 
@@ -135,9 +238,7 @@ class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
         *,
         request_context: (RequestContext[ServerSessionT, LifespanContextT, RequestT] | None) = None,
         fastmcp: Server | None = None,
-        **kwargs: Any,
     ):
-        super().__init__(**kwargs)
         self._request_context = request_context
         self._fastmcp = fastmcp
 
@@ -216,7 +317,7 @@ class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
             The result.data will only be populated if action is "accept" and validation succeeded.
         """
 
-        log.info(f"Calling elicit_with_validation with related_request_id: {self.request_id}")
+        log.info("Calling elicit_with_validation with related_request_id: %s", self.request_id)
         return await elicit_with_validation(
             session=self.request_context.session, message=message, schema=schema, related_request_id=self.request_id
         )
@@ -258,6 +359,11 @@ class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
         """Access to the underlying session for advanced usage."""
         return self.request_context.session
 
+    @property
+    def debug_enabled(self) -> bool:
+        """Whether verbose debug messages should be sent to the client (JMCP_DEBUG=1)"""
+        return _CLIENT_DEBUG
+
     # Convenience methods for common log levels
     async def debug(self, message: str, **extra: Any) -> None:
         """Send a debug log message."""
@@ -276,48 +382,84 @@ class Context(BaseModel, Generic[ServerSessionT, LifespanContextT, RequestT]):
         await self.log("error", message, **extra)
 
 
+def _validate_ipv4(value: str) -> str:
+    """Validate that value is a well-formed IPv4 address (each octet 0-255)"""
+    ipaddress.IPv4Address(value)
+    return value
+
+
+# Hints for single-field elicitations. They are appended to the prompt message
+# rather than embedded in the schema, keeping the schema sent per round-trip small.
+_FIELD_DESCRIPTIONS = {
+    "name": "Enter the device name (e.g., router1-east)",
+    "ip": "Enter the device IP address (e.g., 192.168.1.1)",
+    "port": "Enter the SSH port (default: 22)",
+    "username": "Enter the username for device authentication",
+    "ssh_key_path": "Enter the path to the SSH private key file on the MCP server (e.g., /home/user/.ssh/id_rsa)",
+}
+
+
+class _ElicitationModel(BaseModel):
+    """Base for elicitation schemas: immutable, whitespace stripped during validation."""
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
+
 class ElicitationSchema:
     """Schema definitions for different elicitation types."""
     # Device management schemas
-    class GetDeviceName(BaseModel):
+    class GetDeviceName(_ElicitationModel):
+        name: str = Field(min_length=1, max_length=50)
+
+    class GetDeviceIP(_ElicitationModel):
+        ip: Annotated[str, AfterValidator(_validate_ipv4)]
+
+    class GetDevicePort(_ElicitationModel):
+        port: int = Field(ge=1, le=65535, default=22)
+
+    class GetDeviceUsername(_ElicitationModel):
+        username: str = Field(min_length=1)
+    
+    class GetSSHKeyPath(_ElicitationModel):
+        ssh_key_path: str = Field(min_length=1)
+        
+    class ConfirmDeviceAdd(_ElicitationModel):
+        confirm: bool = Field(description="Confirm adding this device")
+        test_connection: bool = Field(
+            default=False, 
+            description="Test connection to device before adding"
+        )
+
+    class AddDevice(_ElicitationModel):
+        # Composite form collecting everything in one round-trip. The IP is checked
+        # after elicitation so a bad address only re-prompts that single field.
         name: str = Field(
-            description="Enter the device name (e.g., router1-east)",
+            description="Device name (e.g., router1-east)",
             min_length=1,
             max_length=50
         )
-
-    class GetDeviceIP(BaseModel):
         ip: str = Field(
-            description="Enter the device IP address (e.g., 192.168.1.1)",
-            pattern=r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$"
+            description="Device IP address (e.g., 192.168.1.1)",
+            min_length=1
         )
-
-    class GetDevicePort(BaseModel):
         port: int = Field(
-            description="Enter the SSH port (default: 22)",
+            description="SSH port (default: 22)",
             ge=1,
             le=65535,
             default=22
         )
-
-    class GetDeviceUsername(BaseModel):
         username: str = Field(
-            description="Enter the username for device authentication",
+            description="Username for device authentication",
             min_length=1
         )
-    
-    class GetSSHKeyPath(BaseModel):
         ssh_key_path: str = Field(
-            description="Enter the path to the SSH private key file on the MCP server (e.g., /home/user/.ssh/id_rsa)",
+            description="Path to the SSH private key file on the MCP server (e.g., /home/user/.ssh/id_rsa)",
             min_length=1
         )
-        
-    class ConfirmDeviceAdd(BaseModel):
-        confirm: bool = Field(description="Confirm adding this device")
         test_connection: bool = Field(
-            default=False, 
+            default=False,
             description="Test connection to device before adding"
         )
+        confirm: bool = Field(description="Confirm adding this device")
 
 async def elicit_field_value(
     ctx: Context,
@@ -327,51 +469,110 @@ async def elicit_field_value(
 ) -> str | int | Dict[str, Any] | None:
     """Generic elicitation handler with validation and error handling."""
 
+    description = _FIELD_DESCRIPTIONS.get(field_name) if field_name else None
+    if description:
+        message = f"{message}\n{description}"
+
     try:
-        log.info(f"Calling ctx.elicit with schema: {schema_class.__name__}")
+        log.info("Calling ctx.elicit with schema: %s", schema_class.__name__)
         
         # Add timeout to elicitation
-        import asyncio
         try:
             result = await asyncio.wait_for(
                 ctx.elicit(message=message, schema=schema_class),
                 timeout=300.0  # 300 second timeout (5 minutes)
             )
-            log.info(f"Elicit returned result of type: {type(result)}")
+            log.info("Elicit returned result of type: %s", type(result))
         except asyncio.TimeoutError:
             log.error("Elicitation timed out after 300 seconds")
             return None
 
-        match result:
-            case AcceptedElicitation(data=data):
-                # Debug: print what we received
-                log.info(f"Elicitation accepted. Data type: {type(data)}, value: {data}")
-
-                # If field_name is None, return the entire data object
-                if field_name is None:
-                    log.info("Returning full data object")
-                    return data
-                # Otherwise return the specific field
-                if hasattr(data, field_name):
-                    field_value = getattr(data, field_name)
-                    log.info(f"Returning field '{field_name}' with value: {field_value}")
-                    return field_value
-                log.warning(f"Field '{field_name}' not found in data object")
-                return None
-            case DeclinedElicitation():
-                log.info("Elicitation was declined")
-                return None
-            case CancelledElicitation():
-                log.info("Elicitation was cancelled")
-                return None
+        if isinstance(result, AcceptedElicitation):
+            data = result.data
+            # Debug: print what we received
+            log.info("Elicitation accepted. Data type: %s, value: %s", type(data), data)
+
+            # If field_name is None, return the entire data object
+            if field_name is None:
+                log.info("Returning full data object")
+                return data
+            # Otherwise return the specific field
+            if hasattr(data, field_name):
+                field_value = getattr(data, field_name)
+                log.info("Returning field '%s' with value: %s", field_name, field_value)
+                return field_value
+            log.warning("Field '%s' not found in data object", field_name)
+            return None
+        elif isinstance(result, DeclinedElicitation):
+            log.info("Elicitation was declined")
+            return None
+        elif isinstance(result, CancelledElicitation):
+            log.info("Elicitation was cancelled")
+            return None
     except (anyio.ClosedResourceError, ConnectionError) as e:
         print(f"Client disconnected during elicitation: {e}")
         return None
     except Exception as e:
-        log.error(f"Elicitation error: {e}")
+        log.error("Elicitation error: %s", e)
         print(f"Elicitation error: {e}")
         return None
 
+# Constant responses for cancelled add_device elicitations, built once at import
+_CANCEL_NAME = [types.TextContent(type="text", text="❌ Device name input cancelled.")]
+_CANCEL_IP = [types.TextContent(type="text", text="❌ Device IP input cancelled.")]
+_CANCEL_PORT = [types.TextContent(type="text", text="❌ Device port input cancelled.")]
+_CANCEL_USER = [types.TextContent(type="text", text="❌ Username input cancelled.")]
+_CANCEL_KEY = [types.TextContent(type="text", text="❌ SSH key path input cancelled.")]
+_CANCEL_CONFIRM = [types.TextContent(type="text", text="❌ Device addition cancelled.")]
+
+async def _check_ssh_key_path(ctx: Context, ssh_key_path: str) -> bool:
+    """Warn the client and return False if the SSH key file is missing or unreadable"""
+    try:
+        key_stat = os.stat(ssh_key_path)
+    except FileNotFoundError:
+        await ctx.warning(f"SSH key file '{ssh_key_path}' not found. Please enter a valid path.")
+        return False
+    except OSError as e:
+        # e.g. an unreadable parent directory, or a file used as a path component
+        await ctx.warning(f"SSH key file '{ssh_key_path}' cannot be accessed ({e.strerror}). Please enter a valid path.")
+        return False
+    
+    if not stat.S_ISREG(key_stat.st_mode):
+        await ctx.warning(f"SSH key path '{ssh_key_path}' is not a regular file. Please enter a valid path.")
+        return False
+    
+    # os.access honours ACLs, capabilities and non-POSIX platforms
+    if not os.access(ssh_key_path, os.R_OK):
+        await ctx.warning(f"SSH key file '{ssh_key_path}' is not readable. Please check permissions.")
+        return False
+    
+    return True
+
+def _test_device_connection(connect_params: Dict[str, Any], device_name: str) -> None:
+    """Open and close a throwaway session to a new device; raises on failure"""
+    test_device = None
+    try:
+        # Create device instance for testing
+        test_device = Device(**connect_params)
+        test_device.open()
+        test_device.timeout = 10
+    finally:
+        # Ensure test connection is properly closed
+        if test_device is not None:
+            try:
+                if test_device.connected:
+                    log.debug("Explicitly closing test connection to %s", device_name)
+                    test_device.close()
+            except Exception as close_error:
+                log.warning("Error while closing test connection to %s: %s", device_name, close_error)
+                # Force cleanup of the underlying transport
+                try:
+                    if hasattr(test_device, '_conn') and test_device._conn:
+                        test_device._conn.close()
+                except Exception as transport_error:
+                    log.warning("Error while closing test transport to %s: %s", device_name, transport_error)
+
+
 async def handle_add_device(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Add a new Junos device with elicitation for missing information."""
     
@@ -384,9 +585,59 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
     
     ctx = context
     
-    log.info(f"Starting add_device with name='{device_name}', ip='{device_ip}'")
+    log.info("Starting add_device with name='%s', ip='%s'", device_name, device_ip)
     
     try:
+        confirmation = None
+        
+        # Ask for all missing details in a single elicitation; any field that fails
+        # validation is cleared and re-prompted individually below
+        if not (device_name and device_ip and device_port > 0 and username and ssh_key_path):
+            log.info("Device details incomplete, asking user for all details at once")
+            
+            details = await elicit_field_value(
+                ctx, "Please enter the details for the new device:",
+                ElicitationSchema.AddDevice, None
+            )
+            
+            if details is None or not details.confirm:
+                return _CANCEL_CONFIRM
+            
+            fields_valid = True
+            
+            if not device_name:
+                device_name = details.name
+                if device_name in devices:
+                    log.warning("Device '%s' already exists", device_name)
+                    await ctx.warning(f"Device '{device_name}' already exists!")
+                    device_name = ""
+                    fields_valid = False
+            
+            if not device_ip:
+                device_ip = details.ip
+                try:
+                    _validate_ipv4(device_ip)
+                except ValueError:
+                    await ctx.warning(f"'{device_ip}' is not a valid IPv4 address.")
+                    device_ip = ""
+                    fields_valid = False
+            
+            if not device_port or device_port <= 0:
+                device_port = details.port
+            
+            if not username:
+                username = details.username
+            
+            if not ssh_key_path:
+                ssh_key_path = details.ssh_key_path
+                if not await _check_ssh_key_path(ctx, ssh_key_path):
+                    ssh_key_path = ""
+                    fields_valid = False
+            
+            # Only skip the separate confirmation if nothing had to be re-prompted
+            if fields_valid:
+                confirmation = details
+        
         # Step 1: Get device name
         while not device_name:
             log.info("No device name provided, asking user")
@@ -397,14 +648,14 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
             )
             
             if name_result is None:
-                return [types.TextContent(type="text", text="❌ Device name input cancelled.")]
+                return _CANCEL_NAME
             
-            device_name = str(name_result).strip()
-            log.info(f"Received device name: '{device_name}'")
+            device_name = name_result
+            log.info("Received device name: '%s'", device_name)
             
             # Check if device already exists
             if device_name in devices:
-                log.warning(f"Device '{device_name}' already exists")
+                log.warning("Device '%s' already exists", device_name)
                 await ctx.warning(f"Device '{device_name}' already exists!")
                 
                 # Ask for a different name
@@ -421,10 +672,10 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
             )
             
             if ip_result is None:
-                return [types.TextContent(type="text", text="❌ Device IP input cancelled.")]
+                return _CANCEL_IP
             
-            device_ip = str(ip_result).strip()
-            log.info(f"Received device IP: '{device_ip}'")
+            device_ip = ip_result
+            log.info("Received device IP: '%s'", device_ip)
         
         # Step 3: Get device port (with default)
         while not device_port or device_port <= 0:
@@ -436,10 +687,10 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
             )
             
             if port_result is None:
-                return [types.TextContent(type="text", text="❌ Device port input cancelled.")]
+                return _CANCEL_PORT
             
-            device_port = int(port_result)
-            log.info(f"Received device port: {device_port}")
+            device_port = port_result
+            log.info("Received device port: %s", device_port)
         
         # Step 4: Get username
         while not username:
@@ -451,10 +702,10 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
             )
             
             if creds_result is None:
-                return [types.TextContent(type="text", text="❌ Username input cancelled.")]
+                return _CANCEL_USER
             
-            username = str(creds_result).strip()
-            log.info(f"Received username: '{username}'")
+            username = creds_result
+            log.info("Received username: '%s'", username)
         
         # Step 5: Get SSH key path
         while not ssh_key_path:
@@ -466,23 +717,16 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
             )
             
             if ssh_key_result is None:
-                return [types.TextContent(type="text", text="❌ SSH key path input cancelled.")]
+                return _CANCEL_KEY
             
-            ssh_key_path = str(ssh_key_result).strip()
+            ssh_key_path = ssh_key_result
             
-            # Validate SSH key file exists
-            if not os.path.exists(ssh_key_path):
-                await ctx.warning(f"SSH key file '{ssh_key_path}' not found. Please enter a valid path.")
+            # Validate SSH key file exists and is readable
+            if not await _check_ssh_key_path(ctx, ssh_key_path):
                 ssh_key_path = ""
                 continue
             
-            # Check if file is readable
-            if not os.access(ssh_key_path, os.R_OK):
-                await ctx.warning(f"SSH key file '{ssh_key_path}' is not readable. Please check permissions.")
-                ssh_key_path = ""
-                continue
-            
-            log.info(f"Received SSH key path: '{ssh_key_path}'")
+            log.info("Received SSH key path: '%s'", ssh_key_path)
         
         # Step 6: Show summary and ask for confirmation
         device_summary = f"""Device Details:
@@ -492,15 +736,16 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
 • Username: {username}
 • SSH Key: {ssh_key_path}"""
         
-        confirmation = await elicit_field_value(
-            ctx,
-            f"Please confirm adding this device:\n\n{device_summary}",
-            ElicitationSchema.ConfirmDeviceAdd,
-            None
-        )
+        if confirmation is None:
+            confirmation = await elicit_field_value(
+                ctx,
+                f"Please confirm adding this device:\n\n{device_summary}",
+                ElicitationSchema.ConfirmDeviceAdd,
+                None
+            )
         
         if confirmation is None or not confirmation.confirm:
-            return [types.TextContent(type="text", text="❌ Device addition cancelled.")]
+            return _CANCEL_CONFIRM
         
         # Step 7: Optional connection test
         if confirmation.test_connection:
@@ -517,36 +762,17 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
                 }
             }
             
-            test_device = None
             try:
                 connect_params = prepare_connection_params(test_device_info, device_name)
-                
-                # Create device instance for testing
-                test_device = Device(**connect_params)
-                test_device.open()
-                test_device.timeout = 10
+                # Opening the session blocks on SSH/NETCONF setup, so keep it off the event loop
+                await _run_pyez(device_name, _test_device_connection, connect_params, device_name)
                 
                 # Just test the connection, don't run any commands
                 await ctx.info(f"✅ Connection test successful!")
                     
             except Exception as e:
-                log.error(f"Connection test failed for {device_name}: {e}")
+                log.error("Connection test failed for %s: %s", device_name, e)
                 return [types.TextContent(type="text", text=f"❌ Connection test failed: {str(e)}\nDevice not added.")]
-            finally:
-                # Ensure test connection is properly closed
-                if test_device is not None:
-                    try:
-                        if test_device.connected:
-                            log.debug(f"Explicitly closing test connection to {device_name}")
-                            test_device.close()
-                    except Exception as close_error:
-                        log.warning(f"Error while closing test connection to {device_name}: {close_error}")
-                        # Force cleanup of the underlying transport
-                        try:
-                            if hasattr(test_device, '_conn') and test_device._conn:
-                                test_device._conn.close()
-                        except Exception as transport_error:
-                            log.warning(f"Error while closing test transport to {device_name}: {transport_error}")
         
         # Step 8: Add device to global devices dictionary
         new_device_config = {
@@ -563,9 +789,11 @@ async def handle_add_device(arguments: dict, context: Context) -> list[types.Con
         validate_device_config(device_name, new_device_config)
         
         # Add the validated configuration to devices
-        devices[device_name] = new_device_config
+        devices[sys.intern(device_name)] = new_device_config
+        _CONN_PARAMS.pop(device_name, None)
+        _invalidate_router_caches(device_name)
         
-        log.info(f"Successfully added device '{device_name}' to devices dictionary")
+        log.info("Successfully added device '%s' to devices dictionary", device_name)
         await ctx.info(f"Device '{device_name}' added successfully!")
         
         result_message = f"""✅ Device '{device_name}' added successfully!
@@ -580,128 +808,385 @@ The device is now available for use with all Junos MCP tools."""
         return [types.TextContent(type="text", text=result_message)]
         
     except Exception as e:
-        log.error(f"Unexpected error in add_device: {e}")
+        log.error("Unexpected error in add_device: %s", e)
         return [types.TextContent(type="text", text=f"❌ Failed to add device: {str(e)}")]
 
 
 
-def _run_junos_cli_command(router_name: str, command: str, timeout: int = 360) -> str:
+def _router_not_found(router_name: str) -> list[types.ContentBlock]:
+    """Response returned by tool handlers when router_name is not in the device mapping"""
+    return [types.TextContent(
+        type="text",
+        text=f"Router {router_name} not found in the device mapping.",
+        annotations={"router_name": router_name}
+    )]
+
+# Connection parameters per router, keyed by name and tied to the device_info dict they came from
+_CONN_PARAMS: Dict[str, tuple[Dict[str, Any], Dict[str, Any]]] = {}
+
+
+def _connection_params(device_info: Dict[str, Any], router_name: str, timeout: int | None = None) -> Dict[str, Any]:
+    """Return a copy of the (cached) prepare_connection_params result for router_name
+    
+    Args:
+        timeout: Per-call timeout overlaid on the cached parameters, if given
+    
+    Raises:
+        ValueError: If the device configuration is invalid
+    """
+    cached = _CONN_PARAMS.get(router_name)
+    if cached is None or cached[0] is not device_info:
+        cached = _CONN_PARAMS[router_name] = (device_info, prepare_connection_params(device_info, router_name))
+    # Never hand out the cached dict itself
+    if timeout is None:
+        return cached[1].copy()
+    return {**cached[1], 'timeout': timeout}
+
+def _prime_connection_params(device_map: Dict[str, Dict[str, Any]]) -> None:
+    """Build connection parameters for every device at startup (call after validate_all_devices)"""
+    _CONN_PARAMS.clear()
+    for router_name, device_info in device_map.items():
+        _CONN_PARAMS[router_name] = (device_info, prepare_connection_params(device_info, router_name, validated=True))
+
+# Output formats for CLI commands: "text" goes through cli(); the others use the command RPC
+_CLI_OUTPUT_FORMATS = ("text", "xml", "json")
+
+
+def _format_rpc_output(rsp: Any, output_format: str) -> str:
+    """Convert a structured command RPC reply (lxml element or JSON dict) to a string"""
+    if output_format == "json":
+        return orjson.dumps(rsp, option=orjson.OPT_INDENT_2).decode()
+    if isinstance(rsp, bool):  # Empty <rpc-reply/>
+        return ""
+    return etree.tostring(rsp, encoding="unicode", pretty_print=True)
+
+def _run_junos_cli_commands(device_info: Dict[str, Any], router_name: str, commands: List[str],
+                            timeout: int = 360, output_format: str = "text") -> List[Dict[str, str]]:
+    """Internal helper to run several Junos CLI commands over one pooled session
+    
+    Args:
+        output_format: "text" runs commands through cli(); "xml" and "json" use
+            rpc.cli(), which returns structured output and skips cli()'s
+            line-by-line warning scan
+    
+    Returns:
+        One {"command", "output"} pair per command, in order (repeated commands
+        each get their own entry). If the session fails, commands that did not
+        complete get the error message as their output.
+    """
+    log.debug("Executing %d command(s) on router %s with timeout %ss (internal)", len(commands), router_name, timeout)
+    try:
+        connect_params = _connection_params(device_info, router_name)
+    except ValueError as ve:
+        return [{"command": command, "output": f"Error: {ve}"} for command in commands]
+    
+    results: List[Dict[str, str]] = []
+    try:
+        with device_pool.checkout(router_name, connect_params) as junos_device:
+            junos_device.timeout = timeout
+            for command in commands:
+                if output_format == "text":
+                    output = junos_device.cli(command, warning=False)
+                else:
+                    rsp = junos_device.rpc.cli(command, format=output_format)
+                    output = _format_rpc_output(rsp, output_format)
+                results.append({"command": command, "output": output})
+        return results
+    except ConnectError as ce:
+        error = f"Connection error to {router_name}: {ce}"
+    except Exception as e:
+        error = f"An error occurred: {e}"
+    results.extend({"command": command, "output": error} for command in commands[len(results):])
+    return results
+
+def _run_junos_cli_command(device_info: Dict[str, Any], router_name: str, command: str, timeout: int = 360,
+                           output_format: str = "text") -> str:
     """Internal helper to connect and run a Junos CLI command."""
-    log.debug(f"Executing command {command} on router {router_name} with timeout {timeout}s (internal)")
-    device_info = devices[router_name]
+    return _run_junos_cli_commands(device_info, router_name, [command], timeout, output_format)[0]["output"]
+
+def _run_junos_config_rpc(device_info: Dict[str, Any], router_name: str, rpc_attrs: Dict[str, str],
+                          timeout: int = 360) -> str:
+    """Internal helper to fetch configuration text with the get-configuration RPC
+    
+    Unlike "show configuration" through cli(), this skips the device's CLI formatting
+    pipeline. Errors are returned in the same form as _run_junos_cli_commands.
+    
+    Args:
+        rpc_attrs: Attributes of the <get-configuration> element (format, inherit,
+            compare, ...). They are passed as PyEZ's positional attribute dict; keyword
+            arguments would become child elements, which Junos reads as a filter.
+    """
+    log.debug("Fetching configuration from router %s with %s (internal)", router_name, rpc_attrs)
     try:
-        connect_params = prepare_connection_params(device_info, router_name)
+        connect_params = _connection_params(device_info, router_name)
     except ValueError as ve:
         return f"Error: {ve}"
     try:
-        with Device(**connect_params) as junos_device:            
+        with device_pool.checkout(router_name, connect_params) as junos_device:
             junos_device.timeout = timeout
-            op = junos_device.cli(command, warning=False)
-            return op
+            rsp = junos_device.rpc.get_configuration(rpc_attrs)
+            if isinstance(rsp, bool):  # PyEZ returns True for an empty <rpc-reply/>
+                return ""
+            # <configuration-text> or <configuration-information><configuration-output>
+            return "".join(rsp.itertext())
     except ConnectError as ce:
         return f"Connection error to {router_name}: {ce}"
     except Exception as e:
         return f"An error occurred: {e}"
 
+def _int_from_env(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default if unset or invalid"""
+    value = os.getenv(name)
+    if value is not None:
+        try:
+            return int(value)
+        except ValueError:
+            log.warning("Invalid %s environment variable value: %s. Using default %s.", name, value, default)
+    
+    return default
+
+
+def _default_timeout_from_env() -> int:
+    """Resolve the default timeout from the JUNOS_TIMEOUT environment variable (fallback: 360)"""
+    return _int_from_env('JUNOS_TIMEOUT', 360)
+
+
+# Default timeout is resolved once at import time rather than on every tool call
+_DEFAULT_TIMEOUT = _default_timeout_from_env()
+
+
 def get_timeout_with_fallback(arguments_timeout: int = None) -> int:
     """Get timeout value with fallback priority: arguments -> ENV -> default (360)"""
-    if arguments_timeout is not None:
-        return arguments_timeout
+    return arguments_timeout if arguments_timeout is not None else _DEFAULT_TIMEOUT
+
+# Cached index of valid tokens, rebuilt only when the .tokens file changes
+_TOKENS_MTIME = -1
+# sha256(token) -> token ID. Lookups hash the candidate first, so they neither keep raw
+# tokens in memory nor compare secrets byte by byte (timing-safe by construction).
+_TOKENS_INDEX: Dict[bytes, str] = {}
+# Lengths of the valid tokens, used to reject malformed candidates before hashing
+_TOKEN_LENGTHS: frozenset[int] = frozenset()
+# .tokens is stat()ed at most this often, so revocations propagate within a few seconds
+_TOKENS_RELOAD_INTERVAL = 5
+_TOKENS_CHECKED_AT = float("-inf")
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _refresh_tokens() -> None:
+    """Reload the valid token index if .tokens has changed (or disappeared) since the last load"""
+    global _TOKENS_MTIME, _TOKENS_INDEX, _TOKEN_LENGTHS, _TOKENS_CHECKED_AT
+    _TOKENS_CHECKED_AT = time.monotonic()
+    try:
+        st = os.stat(".tokens")
+    except FileNotFoundError:
+        _TOKENS_MTIME, _TOKENS_INDEX, _TOKEN_LENGTHS = -1, {}, frozenset()
+        return
     
-    env_timeout = os.getenv('JUNOS_TIMEOUT')
-    if env_timeout is not None:
+    if st.st_mtime_ns != _TOKENS_MTIME:
         try:
-            return int(env_timeout)
-        except ValueError:
-            log.warning(f"Invalid JUNOS_TIMEOUT environment variable value: {env_timeout}. Using default timeout.")
-    
-    return 360
+            with open(".tokens", 'rb') as f:
+                tokens = orjson.loads(f.read())
+            valid = {
+                token_data['token']: token_id
+                for token_id, token_data in tokens.items() if 'token' in token_data
+            }
+        except (orjson.JSONDecodeError, FileNotFoundError, AttributeError, TypeError):
+            valid = {}
+        _TOKENS_INDEX = {_token_digest(token): token_id for token, token_id in valid.items()}
+        _TOKEN_LENGTHS = frozenset(map(len, valid))
+        _TOKENS_MTIME = st.st_mtime_ns
+
+
+def _valid_token_lengths() -> frozenset[int]:
+    """Return the lengths of the currently valid tokens, reloading .tokens if it is due"""
+    if time.monotonic() - _TOKENS_CHECKED_AT >= _TOKENS_RELOAD_INTERVAL:
+        _refresh_tokens()
+    return _TOKEN_LENGTHS
+
+
+def token_id_from_file(token: str) -> str | None:
+    """Return the ID of a token listed in the .tokens file, or None if it is not valid"""
+    if len(token) not in _valid_token_lengths():
+        return None
+    return _TOKENS_INDEX.get(_token_digest(token))
+
 
 def validate_token_from_file(token: str) -> bool:
     """Validate if a token exists in the .tokens file"""
-    try:
-        if not os.path.exists(".tokens"):
-            return False
-        
-        with open(".tokens", 'r') as f:
-            tokens = json.load(f)
-        
-        for token_data in tokens.values():
-            if token_data.get('token') == token:
-                return True
-        
-        return False
-    except (json.JSONDecodeError, FileNotFoundError, KeyError):
-        return False
+    return token_id_from_file(token) is not None
+
+
+_BEARER = b"Bearer "
+_BEARER_LEN = len(_BEARER)
 
 
-class BearerTokenMiddleware(BaseHTTPMiddleware):
-    """Middleware to check Bearer token authentication for streamable-http"""
+def _client_host(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else 'unknown'
+
+
+class BearerTokenMiddleware:
+    """Middleware to check Bearer token authentication for streamable-http
+    
+    A plain ASGI middleware: it only inspects headers, so it forwards the
+    original receive/send channels instead of wrapping them in a task group
+    the way BaseHTTPMiddleware does.
+    """
     
-    def __init__(self, app, auth_enabled: bool = True):
-        super().__init__(app)
+    # Seconds a validated token is trusted before .tokens is consulted again
+    _CACHE_TTL = 30
+    # Sweep expired cache entries after this many insertions
+    _CACHE_SWEEP_EVERY = 256
+    
+    def __init__(self, app: ASGIApp, auth_enabled: bool = True):
+        self.app = app
         self.auth_enabled = auth_enabled
+        # sha256(token) -> expiry (monotonic); raw tokens are never kept in the cache
+        self._valid_cache: Dict[bytes, float] = {}
+        self._cache_inserts = 0
     
-    async def dispatch(self, request: Request, call_next):
-        # Log all incoming requests during elicitation debugging
-        log.info(f"Incoming request: {request.method} {request.url.path} from {request.client.host if request.client else 'unknown'}")
+    def _is_valid_token(self, token: str) -> bool:
+        """Check a bearer token, trusting recent successful validations for _CACHE_TTL seconds"""
+        # Tokens of a length no valid token has are rejected without hashing
+        if len(token) not in _valid_token_lengths():
+            return False
+        
+        token_hash = _token_digest(token)
+        now = time.monotonic()
+        if self._valid_cache.get(token_hash, 0.0) > now:
+            return True
         
-        # Try to read request body for debugging
-        if request.method == "POST":
+        token_id = _TOKENS_INDEX.get(token_hash)
+        if token_id is None:
+            self._valid_cache.pop(token_hash, None)
+            return False
+        
+        log.debug("Validated token '%s'", token_id)
+        self._valid_cache[token_hash] = now + self._CACHE_TTL
+        self._cache_inserts += 1
+        if self._cache_inserts % self._CACHE_SWEEP_EVERY == 0:
+            self._valid_cache = {h: exp for h, exp in self._valid_cache.items() if exp > now}
+        return True
+    
+    @staticmethod
+    async def _log_body(receive: Receive) -> Receive:
+        """Log the request body and return a receive callable that replays it
+        
+        A message other than http.request (e.g. http.disconnect) ends the body early;
+        it is kept and handed back after the replayed body, since it cannot be received again.
+        """
+        body = b""
+        pending = None
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                pending = message
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        if body:
             try:
-                body = await request.body()
-                if body:
-                    import json
-                    try:
-                        parsed_body = json.loads(body.decode())
-                        log.info(f"Request body: {parsed_body}")
-                    except:
-                        log.info(f"Raw request body: {body[:200]}...")
-            except Exception as e:
-                log.warning(f"Could not read request body: {e}")
+                log.debug("Request body: %s", orjson.loads(body))
+            except orjson.JSONDecodeError:
+                log.debug("Raw request body: %s...", body[:200])
+        
+        replayed = False
+        
+        async def replay():
+            nonlocal replayed, pending
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            if pending is not None:
+                message, pending = pending, None
+                return message
+            return await receive()
+        
+        return replay
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if log.isEnabledFor(logging.DEBUG):
+            # Log all incoming requests during elicitation debugging
+            log.debug("Incoming request: %s %s from %s", scope["method"], scope["path"], _client_host(scope))
+            if scope["method"] == "POST":
+                try:
+                    receive = await self._log_body(receive)
+                except Exception as e:
+                    log.warning("Could not read request body: %s", e)
         
         # Skip auth if disabled (for stdio transport)
         if not self.auth_enabled:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         
-        auth_header = request.headers.get("authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            log.warning(f"Missing or invalid auth header for {request.method} {request.url.path}")
-            return JSONResponse(
-                {"error": "Missing or invalid Authorization header"}, 
-                status_code=401
-            )
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
         
-        token = auth_header[7:]  # Remove "Bearer " prefix
+        if not auth_header or not auth_header.startswith(_BEARER):
+            log.warning("Missing or invalid auth header for %s %s", scope["method"], scope["path"])
+            response = JSONResponse({"error": "Missing or invalid Authorization header"}, status_code=401)
+            await response(scope, receive, send)
+            return
         
-        # Validate token against .tokens file
-        if not validate_token_from_file(token):
-            log.warning(f"Invalid token attempt from {request.client.host if request.client else 'unknown'}")
-            return JSONResponse(
-                {"error": "Invalid token"}, 
-                status_code=401
-            )
+        # Header values are latin-1, as starlette decodes them
+        token = auth_header[_BEARER_LEN:].decode("latin-1")
+        
+        # Validate token against .tokens file (recent successes are cached)
+        if not self._is_valid_token(token):
+            log.warning("Invalid token attempt from %s", _client_host(scope))
+            response = JSONResponse({"error": "Invalid token"}, status_code=401)
+            await response(scope, receive, send)
+            return
         
         log.debug("Token validation successful")
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 async def handle_execute_junos_command(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Handler for execute_junos_command tool"""
-    start_time = time.time()
-    start_timestamp = datetime.now(timezone.utc).isoformat()
+    start_perf = time.perf_counter()
+    start_ts = datetime.now(timezone.utc)
     router_name = arguments.get("router_name", "")
     command = arguments.get("command", "")
     timeout = get_timeout_with_fallback(arguments.get("timeout"))
+    output_format = arguments.get("format", "text")
+    max_output_chars = arguments.get("max_output_chars") or 0
     
-    if router_name not in devices:
-        result = f"Router {router_name} not found in the device mapping."
-    else:
-        log.debug(f"Executing command {command} on router {router_name} with timeout {timeout}s")
-        result = _run_junos_cli_command(router_name, command, timeout)
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    if output_format not in _CLI_OUTPUT_FORMATS:
+        return [types.TextContent(
+            type="text",
+            text=f"Error: Unsupported output format '{output_format}'. Use 'text', 'xml', or 'json'",
+            annotations={"router_name": router_name}
+        )]
+    
+    log.debug("Executing command %s on router %s with timeout %ss", command, router_name, timeout)
+    result = await _run_pyez(router_name, _run_junos_cli_command, device_info, router_name, command, timeout, output_format)
+    
+    # Bound the response for very large outputs (e.g. full routing tables)
+    output_chars = len(result)
+    truncated = 0 < max_output_chars < output_chars
+    if truncated:
+        result = (f"{result[:max_output_chars]}\n... output truncated ({output_chars} characters total);"
+                  f" narrow the command with '| match' or '| count' to see the rest")
     
-    end_time = time.time()
-    end_timestamp = datetime.now(timezone.utc).isoformat()
-    execution_duration = round(end_time - start_time, 3)
+    elapsed = time.perf_counter() - start_perf
+    execution_duration = round(elapsed, 3)
+    start_timestamp = start_ts.isoformat()
+    end_timestamp = (start_ts + timedelta(seconds=elapsed)).isoformat()
     content_block = types.TextContent(
         type="text",
         text=result,
@@ -710,29 +1195,91 @@ async def handle_execute_junos_command(arguments: dict, context: Context) -> lis
                      "metadata": {
                         "execution_duration": execution_duration,
                         "start_time": start_timestamp,
-                        "end_time": end_timestamp
+                        "end_time": end_timestamp,
+                        "output_chars": output_chars,
+                        "truncated": truncated
                         }
                     })
-    log.debug(f"content block: {content_block}")
+    log.debug("content block: %s", content_block)
+    return [content_block]
+
+
+async def handle_execute_junos_commands(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for execute_junos_commands tool"""
+    router_name = arguments.get("router_name", "")
+    commands = arguments.get("commands", [])
+    timeout = get_timeout_with_fallback(arguments.get("timeout"))
+    output_format = arguments.get("format", "text")
+    
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    if not commands:
+        return [types.TextContent(
+            type="text",
+            text="Error: commands must be a non-empty list",
+            annotations={"router_name": router_name}
+        )]
+    
+    if output_format not in _CLI_OUTPUT_FORMATS:
+        return [types.TextContent(
+            type="text",
+            text=f"Error: Unsupported output format '{output_format}'. Use 'text', 'xml', or 'json'",
+            annotations={"router_name": router_name}
+        )]
+    
+    log.debug("Executing %d command(s) on router %s with timeout %ss", len(commands), router_name, timeout)
+    results = await _run_pyez(router_name, _run_junos_cli_commands, device_info, router_name, commands, timeout, output_format)
+    
+    content_block = types.TextContent(
+        type="text",
+        text=orjson.dumps(results, option=orjson.OPT_INDENT_2).decode(),
+        annotations={"router_name": router_name, "commands": commands}
+        )
+    log.debug("content block: %s", content_block)
     return [content_block]
 
 
+# Running configuration keyed by router name: (fetch time, CLI output). Kept short-lived
+# because configuration can also change outside this server.
+_CONFIG_CACHE: Dict[str, tuple[float, str]] = {}
+_CONFIG_TTL = 15
+
+# Prefixes of the error strings returned by the CLI/RPC helpers (never cached)
+_CLI_ERROR_PREFIXES = ("Error: ", "Connection error to ", "An error occurred: ")
+
+
 async def handle_get_junos_config(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Handler for get_junos_config tool"""
     router_name = arguments.get("router_name", "")
     
-    if router_name not in devices:
-        result = f"Router {router_name} not found in the device mapping."
-    else:
-        log.debug(f"Getting configuration from router {router_name}")
-        result = _run_junos_cli_command(router_name, "show configuration | display inheritance no-comments | no-more")
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    fetched_at, cached = _CONFIG_CACHE.get(router_name, (0.0, None))
+    if cached is not None and time.monotonic() - fetched_at < _CONFIG_TTL:
+        log.debug("Returning cached configuration for router %s", router_name)
+        return [types.TextContent(
+            type="text",
+            text=cached,
+            annotations={"router_name": router_name, "cached": True}
+        )]
+    
+    log.debug("Getting configuration from router %s", router_name)
+    result = await _run_pyez(
+        router_name, _run_junos_config_rpc, device_info, router_name, {"format": "text", "inherit": "inherit"}
+    )
+    if not result.startswith(_CLI_ERROR_PREFIXES):
+        _CONFIG_CACHE[router_name] = (time.monotonic(), result)
     
     content_block = types.TextContent(
         type="text",
         text=result,
         annotations={"router_name": router_name}
         )
-    log.debug(f"content block: {content_block}")
+    log.debug("content block: %s", content_block)
 
     return [content_block]
 
@@ -742,18 +1289,24 @@ async def handle_junos_config_diff(arguments: dict, context: Context) -> list[ty
     router_name = arguments.get("router_name", "")
     version = arguments.get("version", 1)
     
-    if router_name not in devices:
-        result = f"Router {router_name} not found in the device mapping."
-    else:
-        log.debug(f"Getting configuration diff from router {router_name} for version {version}")
-        result = _run_junos_cli_command(router_name, f"show configuration | compare rollback {version}")
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    log.debug("Getting configuration diff from router %s for version %s", router_name, version)
+    # Someone is inspecting changes; don't short-circuit the next load on a stale digest
+    _LAST_APPLIED.pop(router_name, None)
+    result = await _run_pyez(
+        router_name, _run_junos_config_rpc, device_info, router_name,
+        {"format": "text", "compare": "rollback", "rollback": str(version)}
+    )
 
     content_block = types.TextContent(
         type="text",
         text=result,
         annotations={"router_name": router_name, "config_diff_version": version}
         )
-    log.debug(f"content block: {content_block}")
+    log.debug("content block: %s", content_block)
 
     return [content_block]
 
@@ -787,8 +1340,6 @@ async def handle_render_and_apply_j2_template(arguments: dict, context) -> list[
     commit_comment = arguments.get("commit_comment", "Configuration applied via Jinja2 template")
     dry_run = arguments.get("dry_run", False)
     
-    results = []
-    
     # Step 1: Validate inputs
     if not template_content:
         return [types.TextContent(
@@ -806,10 +1357,27 @@ async def handle_render_and_apply_j2_template(arguments: dict, context) -> list[
     if router_name and not router_names:
         router_names = [router_name]
     
+    # Reject bad apply requests before paying for YAML parsing and rendering
+    if apply_config:
+        if not router_names:
+            return [types.TextContent(
+                type="text",
+                text="❌ Error: router_name or router_names must be provided when apply_config=true"
+            )]
+        unknown_routers = [r for r in router_names if r not in devices]
+        if unknown_routers:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ Error: Router(s) not found in device mapping: {', '.join(unknown_routers)}",
+                annotations={"router_names": unknown_routers}
+            )]
+    
+    variables_sha256 = hashlib.sha256(vars_content.encode()).hexdigest()
+    
     # Step 2: Load variables from YAML string
     try:
         await context.info("Parsing variables from YAML content...")
-        variables = yaml.safe_load(vars_content)
+        variables = _parse_vars(vars_content)
         
         if not variables:
             return [types.TextContent(
@@ -817,7 +1385,8 @@ async def handle_render_and_apply_j2_template(arguments: dict, context) -> list[
                 text="❌ Error: Variables content is empty or invalid"
             )]
             
-        await context.debug(f"Loaded variables: {variables}")
+        if context.debug_enabled:
+            await context.debug(f"Loaded variables: {variables}")
         
     except yaml.YAMLError as e:
         return [types.TextContent(
@@ -834,16 +1403,11 @@ async def handle_render_and_apply_j2_template(arguments: dict, context) -> list[
     try:
         await context.info("Rendering Jinja2 template...")
         
-        env = Environment(
-            trim_blocks=True,
-            lstrip_blocks=True,
-            autoescape=False
-        )
-        
-        template = env.from_string(template_content)
+        template = _compile_template(template_content)
         rendered_config = template.render(variables)
         
-        await context.debug(f"Rendered configuration:\n{rendered_config}")
+        if context.debug_enabled:
+            await context.debug(f"Rendered configuration:\n{rendered_config}")
         
     except TemplateError as e:
         return [types.TextContent(
@@ -858,12 +1422,12 @@ async def handle_render_and_apply_j2_template(arguments: dict, context) -> list[
     
     # Step 4: If not applying, just return the rendered config
     if not apply_config:
+        # The full configuration travels in the annotations only; the text is a short summary
+        rendered_sha256 = hashlib.sha256(rendered_config.encode()).hexdigest()
         result_text = f"""✅ Template rendered successfully!
 
-**Rendered Configuration:**
-```
-{rendered_config}
-```
+**Rendered Configuration:** {len(rendered_config)} bytes, {len(rendered_config.splitlines())} lines, sha256={rendered_sha256[:12]}
+(full text in the `rendered_config` annotation)
 
 To apply this configuration to devices, set apply_config=true and provide router_name or router_names.
 """
@@ -872,34 +1436,19 @@ To apply this configuration to devices, set apply_config=true and provide router
             text=result_text,
             annotations={
                 "rendered_config": rendered_config,
-                "variables": str(variables)
+                "variables_sha256": variables_sha256
             }
         )]
     
-    # Step 5: Apply configuration to specified routers
-    if not router_names:
-        return [types.TextContent(
-            type="text",
-            text="❌ Error: router_name or router_names must be provided when apply_config=true"
-        )]
+    # Step 5: Apply configuration to specified routers (validated above)
+    # Apply to all routers concurrently, bounded so devices aren't flooded with SSH sessions
+    semaphore = asyncio.Semaphore(_APPLY_CONCURRENCY)
     
-    # Import devices from global scope
-    from __main__ import devices
-    
-    application_results = []
-    
-    for rtr_name in router_names:
-        if rtr_name not in devices:
-            application_results.append(f"❌ {rtr_name}: Router not found in device mapping")
-            await context.warning(f"Router {rtr_name} not found")
-            continue
-        
-        try:
+    async def apply_to_router(rtr_name: str) -> str:
+        async with semaphore:
             await context.info(f"Applying configuration to {rtr_name}...")
             
             # Use the existing load_and_commit_config handler
-            from __main__ import handle_load_and_commit_config
-            
             apply_args = {
                 "router_name": rtr_name,
                 "config_text": rendered_config,
@@ -909,34 +1458,27 @@ To apply this configuration to devices, set apply_config=true and provide router
             }
             
             result = await handle_load_and_commit_config(apply_args, context)
-            
-            # Extract the text from the result
-            if result and len(result) > 0:
-                result_text = result[0].text
-                application_results.append(f"{'🔍' if dry_run else '✅'} {rtr_name}: {result_text}")
-            else:
-                application_results.append(f"❓ {rtr_name}: Unknown result")
-                
-        except Exception as e:
-            error_msg = f"❌ {rtr_name}: Failed to apply configuration: {e}"
-            application_results.append(error_msg)
-            await context.error(error_msg)
+        
+        # Extract the text from the result
+        if result and len(result) > 0:
+            return f"{'🔍' if dry_run else '✅'} {rtr_name}: {result[0].text}"
+        return f"❓ {rtr_name}: Unknown result"
     
-    # Step 6: Format final results
-    summary = "\n".join(application_results)
+    outcomes = await asyncio.gather(*(apply_to_router(r) for r in router_names), return_exceptions=True)
     
-    final_text = f"""{'🔍 DRY RUN - ' if dry_run else ''}Configuration {'preview' if dry_run else 'application'} complete!
-
-**Routers:** {', '.join(router_names)}
-
-**Rendered Configuration:**
-```
-{rendered_config}
-```
-
-**Results:**
-{summary}
-"""
+    # Step 6: Format final results. The rendered configuration is returned in the
+    # annotations only, so large configs are not repeated in the text body.
+    buf = io.StringIO()
+    buf.write(f"{'🔍 DRY RUN - ' if dry_run else ''}Configuration {'preview' if dry_run else 'application'} complete!\n\n")
+    buf.write(f"**Routers:** {', '.join(router_names)}\n\n")
+    buf.write("**Results:**\n")
+    for rtr_name, outcome in zip(router_names, outcomes):
+        if isinstance(outcome, Exception):
+            outcome = f"❌ {rtr_name}: Failed to apply configuration: {outcome}"
+            await context.error(outcome)
+        buf.write(outcome)
+        buf.write("\n")
+    final_text = buf.getvalue()
     
     return [types.TextContent(
         type="text",
@@ -945,141 +1487,398 @@ To apply this configuration to devices, set apply_config=true and provide router
             "router_names": router_names,
             "rendered_config": rendered_config,
             "dry_run": dry_run,
-            "variables": str(variables)
+            "variables_sha256": variables_sha256
         }
     )]
 
 
 
+# Serialized device facts keyed by router name: (fetch time, JSON text)
+_FACTS_CACHE: Dict[str, tuple[float, str]] = {}
+# Seconds facts are served from the cache; override with JMCP_FACTS_TTL (0 disables caching)
+_FACTS_TTL = _int_from_env('JMCP_FACTS_TTL', 300)
+
+
+def _facts_json_serializer(obj):
+    """JSON fallback for version_info and other complex fact values"""
+    if hasattr(obj, '_asdict'):  # Named tuples like version_info
+        return obj._asdict()
+    elif hasattr(obj, '__dict__'):  # Objects with __dict__
+        return obj.__dict__
+    else:
+        return str(obj)
+
+
+def _gather_facts(connect_params: Dict[str, Any], router_name: str) -> str:
+    """Blocking PyEZ facts collection; run it in a worker thread"""
+    try:
+        with device_pool.checkout(router_name, connect_params) as junos_device:
+            junos_device.timeout = connect_params['timeout']
+            # Pooled sessions keep their fact cache, so re-read facts from the device
+            junos_device.facts_refresh()
+            # Convert _FactCache to a regular dict
+            facts_dict = dict(junos_device.facts)
+            result = orjson.dumps(
+                facts_dict,
+                default=_facts_json_serializer,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+            _FACTS_CACHE[router_name] = (time.monotonic(), result)
+            return result
+    except ConnectError as ce:
+        return f"Connection error to {router_name}: {ce}"
+    except Exception as e:
+        return f"An error occurred: {e}"
+
+
 async def handle_gather_device_facts(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Handler for gather_device_facts tool"""
     router_name = arguments.get("router_name", "")
     timeout = get_timeout_with_fallback(arguments.get("timeout"))
     
-    if router_name not in devices:
-        result = f"Router {router_name} not found in the device mapping."
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    # Facts change rarely; serve recent results from the cache unless a refresh is requested
+    if not arguments.get("force_refresh", False):
+        fetched_at, cached = _FACTS_CACHE.get(router_name, (0.0, None))
+        if cached is not None and time.monotonic() - fetched_at < _FACTS_TTL:
+            log.debug("Returning cached facts for router %s", router_name)
+            return [types.TextContent(
+                type="text",
+                text=cached,
+                annotations={"router_name": router_name, "cached": True}
+            )]
+    
+    log.debug("Getting facts from router %s with timeout %ss", router_name, timeout)
+    try:
+        connect_params = _connection_params(device_info, router_name, timeout)
+    except ValueError as ve:
+        result = f"Error: {ve}"
     else:
-        log.debug(f"Getting facts from router {router_name} with timeout {timeout}s")
-        device_info = devices[router_name]
-        try:
-            connect_params = prepare_connection_params(device_info, router_name)
-            connect_params['timeout'] = timeout
-        except ValueError as ve:
-            result = f"Error: {ve}"
-        else:
-            try:
-                with Device(**connect_params) as junos_device:
-                    facts = junos_device.facts
-                    # Convert _FactCache to a regular dict
-                    facts_dict = dict(facts)
-                    
-                    # Custom JSON encoder to handle version_info and other complex objects
-                    def json_serializer(obj):
-                        if hasattr(obj, '_asdict'):  # Named tuples like version_info
-                            return obj._asdict()
-                        elif hasattr(obj, '__dict__'):  # Objects with __dict__
-                            return obj.__dict__
-                        else:
-                            return str(obj)
-                    
-                    result = json.dumps(facts_dict, indent=2, default=json_serializer)
-            except ConnectError as ce:
-                result = f"Connection error to {router_name}: {ce}"
-            except Exception as e:
-                result = f"An error occurred: {e}"
+        result = await _run_pyez(router_name, _gather_facts, connect_params, router_name)
 
     content_block = types.TextContent(
         type="text",
         text=result,
         annotations={"router_name": router_name}
         )
-    log.debug(f"content block: {content_block}")
+    log.debug("content block: %s", content_block)
     
     return [content_block]
 
 
+# Joined router names, rebuilt only when the device mapping object or its size changes
+# (devices is replaced at startup and only grows through add_device)
+_ROUTER_LIST_CACHE: tuple[int, int, str] = (0, 0, "")
+
+
+def _router_list_text() -> str:
+    """Return the comma-separated router names for get_router_list"""
+    global _ROUTER_LIST_CACHE
+    key = (id(devices), len(devices))
+    if _ROUTER_LIST_CACHE[:2] != key:
+        _ROUTER_LIST_CACHE = (*key, ', '.join(devices))
+    return _ROUTER_LIST_CACHE[2]
+
+
 async def handle_get_router_list(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Handler for get_router_list tool"""
     log.debug("Getting list of routers")
-    routers = list(devices.keys())
-    result = ', '.join(routers)
+    result = _router_list_text()
     
     content_block = types.TextContent(
         type="text",
         text=result
         )
     
-    log.debug(f"content block: {content_block}")
+    log.debug("content block: %s", content_block)
     return [content_block]
 
 
+def _invalidate_router_caches(router_name: str) -> bool:
+    """Drop cached facts, configuration and last-applied payload for a router
+    
+    Returns True if anything was cached.
+    """
+    had_facts = _FACTS_CACHE.pop(router_name, None) is not None
+    had_config = _CONFIG_CACHE.pop(router_name, None) is not None
+    had_applied = _LAST_APPLIED.pop(router_name, None) is not None
+    return had_facts or had_config or had_applied
+
+
+async def handle_invalidate_cache(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for invalidate_cache tool"""
+    router_name = arguments.get("router_name", "")
+    
+    if router_name:
+        log.debug("Invalidating cached data for router %s", router_name)
+        dropped = _invalidate_router_caches(router_name)
+        result = f"Cache {'cleared' if dropped else 'was already empty'} for {router_name}"
+    else:
+        log.debug("Invalidating cached data for all routers")
+        _FACTS_CACHE.clear()
+        _CONFIG_CACHE.clear()
+        _LAST_APPLIED.clear()
+        result = "Cache cleared for all routers"
+    
+    return [types.TextContent(
+        type="text",
+        text=result,
+        annotations={"router_name": router_name}
+    )]
+
+
+async def _fan_out(router_names: List[str], handler, arguments_for, context: Context) -> list[types.ContentBlock]:
+    """Run a per-router tool handler for many routers concurrently
+    
+    Args:
+        router_names: Routers to run the handler for
+        handler: Per-router tool handler (returns a list of content blocks)
+        arguments_for: Callable building the handler arguments for a router name
+        context: MCP Context object
+    
+    Returns:
+        The content blocks of every router, in router_names order
+    """
+    semaphore = asyncio.Semaphore(_BULK_CONCURRENCY)
+    
+    async def run_one(rtr_name: str) -> list[types.ContentBlock]:
+        async with semaphore:
+            return await handler(arguments_for(rtr_name), context)
+    
+    outcomes = await asyncio.gather(*(run_one(r) for r in router_names), return_exceptions=True)
+    
+    blocks: list[types.ContentBlock] = []
+    for rtr_name, outcome in zip(router_names, outcomes):
+        if isinstance(outcome, Exception):
+            log.error("Bulk call failed for router %s: %s", rtr_name, outcome)
+            blocks.append(types.TextContent(
+                type="text",
+                text=f"An error occurred: {outcome}",
+                annotations={"router_name": rtr_name}
+            ))
+        else:
+            blocks.extend(outcome)
+    return blocks
+
+
+async def handle_gather_facts_bulk(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for gather_facts_bulk tool"""
+    router_names = arguments.get("router_names", [])
+    timeout = arguments.get("timeout")
+    force_refresh = arguments.get("force_refresh", False)
+    
+    log.debug("Gathering facts from %d router(s)", len(router_names))
+    return await _fan_out(
+        router_names,
+        handle_gather_device_facts,
+        lambda rtr_name: {"router_name": rtr_name, "timeout": timeout, "force_refresh": force_refresh},
+        context
+    )
+
+
+async def handle_execute_junos_command_bulk(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for execute_junos_command_bulk tool"""
+    commands = arguments.get("commands", {})
+    timeout = arguments.get("timeout")
+    
+    log.debug("Executing commands on %d router(s)", len(commands))
+    return await _fan_out(
+        list(commands),
+        handle_execute_junos_command,
+        lambda rtr_name: {"router_name": rtr_name, "command": commands[rtr_name], "timeout": timeout},
+        context
+    )
+
+
+async def handle_execute_junos_command_multi(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for execute_junos_command_multi tool"""
+    requested = arguments.get("router_names", [])
+    command = arguments.get("command", "")
+    timeout = arguments.get("timeout")
+    output_format = arguments.get("format", "text")
+    max_output_chars = arguments.get("max_output_chars") or 0
+    
+    # Run each router once, in the order first given
+    router_names = list(dict.fromkeys(requested))
+    blocks: list[types.ContentBlock] = []
+    if len(router_names) < len(requested):
+        duplicates = sorted({r for r in requested if requested.count(r) > 1})
+        blocks.append(types.TextContent(
+            type="text",
+            text=f"Note: duplicate router names ignored: {', '.join(duplicates)}",
+            annotations={"router_names": duplicates}
+        ))
+    
+    log.debug("Executing command %s on %d router(s)", command, len(router_names))
+    blocks.extend(await _fan_out(
+        router_names,
+        handle_execute_junos_command,
+        lambda rtr_name: {"router_name": rtr_name, "command": command, "timeout": timeout,
+                          "format": output_format, "max_output_chars": max_output_chars},
+        context
+    ))
+    return blocks
+
+
+# Configuration formats accepted by Config.load
+_CONFIG_FORMATS = frozenset({"set", "text", "xml"})
+
+
+# Config utility per router, reused while it is bound to the router's current pooled Device
+_CONFIG_UTILS: Dict[str, Config] = {}
+
+
+def _config_util_for(router_name: str, junos_device: Device) -> Config:
+    """Return the Config utility for a pooled device (caller must hold the pool checkout)"""
+    config_util = _CONFIG_UTILS.get(router_name)
+    if config_util is None or config_util.dev is not junos_device:
+        # First use, or the pool has reconnected with a new Device
+        config_util = _CONFIG_UTILS[router_name] = Config(junos_device)
+    return config_util
+
+
+# Digest of the payload last loaded in full on each router: (time, digest). With skip_diff,
+# a repeat of the same payload within _CONFIG_TTL is answered without a NETCONF session.
+# Commits, failed loads and the other config-touching tools drop the entry (see
+# _invalidate_router_caches).
+_LAST_APPLIED: Dict[str, tuple[float, bytes]] = {}
+
+
+def _payload_digest(config_chunks: List[tuple[str, str]]) -> bytes:
+    """Digest of (text, format) chunks, framed so different chunkings never collide"""
+    h = hashlib.blake2b(digest_size=16)
+    for chunk, chunk_format in config_chunks:
+        data = chunk.encode()
+        h.update(f"{chunk_format}:{len(data)}:".encode())
+        h.update(data)
+    return h.digest()
+
+
+def _load_and_commit(connect_params: Dict[str, Any], router_name: str, config_chunks: List[tuple[str, str]],
+                     commit_comment: str, timeout: int, skip_diff: bool = False,
+                     payload_digest: bytes | None = None) -> str:
+    """Blocking PyEZ load/diff/commit sequence; run it in a worker thread
+    
+    config_chunks are (config text, format) pairs, loaded in order under one lock
+    and committed once. Formats must already be one of _CONFIG_FORMATS (lower-case).
+    With skip_diff the candidate is committed without the diff round-trip, so a
+    load that changes nothing still produces a commit (and a rollback entry).
+    """
+    try:
+        with device_pool.checkout(router_name, connect_params) as junos_device:
+            junos_device.timeout = connect_params['timeout']
+            config_util = _config_util_for(router_name, junos_device)
+            
+            # Lock the configuration
+            try:
+                config_util.lock()
+            except Exception as e:
+                result = f"Failed to lock configuration: {e}"
+            else:
+                try:
+                    for chunk, chunk_format in config_chunks:
+                        config_util.load(chunk, format=chunk_format)
+                    
+                    # Check for differences (an extra RPC the caller can opt out of)
+                    diff = None if skip_diff else config_util.diff()
+                    if not skip_diff and not diff:
+                        config_util.unlock()
+                        result = "No configuration changes detected"
+                    else:
+                        # Commit the configuration
+                        config_util.commit(comment=commit_comment, timeout=timeout)
+                        config_util.unlock()
+                        # Committed changes may alter facts such as the hostname
+                        _invalidate_router_caches(router_name)
+                        result = f"Configuration successfully loaded and committed on {router_name}"
+                        if skip_diff:
+                            result += " (diff skipped: a commit was created whether or not anything changed)"
+                        elif diff:
+                            result += f". Changes:\n{diff}"
+                    
+                    # The device now matches this payload
+                    if payload_digest is not None:
+                        _LAST_APPLIED[router_name] = (time.monotonic(), payload_digest)
+                        
+                except Exception as e:
+                    # If anything fails, rollback and unlock
+                    try:
+                        config_util.rollback()
+                        config_util.unlock()
+                    except:
+                        pass
+                    # The commit may or may not have gone through
+                    _invalidate_router_caches(router_name)
+                    result = f"Failed to load/commit configuration: {e}"
+                    
+    except ConnectError as ce:
+        _invalidate_router_caches(router_name)
+        result = f"Connection error to {router_name}: {ce}"
+    except Exception as e:
+        _invalidate_router_caches(router_name)
+        result = f"An error occurred: {e}"
+    
+    return result
+
+
+async def _commit_chunks(device_info: Dict[str, Any], router_name: str, config_chunks: List[tuple[str, str]],
+                         commit_comment: str, timeout: int, skip_diff: bool = False) -> str:
+    """Prepare connection parameters and run _load_and_commit in a worker thread
+    
+    With skip_diff, a payload identical to the one last applied on the router within
+    _CONFIG_TTL seconds is reported as unchanged without contacting the device.
+    Without it the device always computes the diff.
+    """
+    payload_digest = _payload_digest(config_chunks)
+    if skip_diff:
+        applied_at, last_digest = _LAST_APPLIED.get(router_name, (0.0, None))
+        if last_digest == payload_digest and time.monotonic() - applied_at < _CONFIG_TTL:
+            log.debug("Skipping load on router %s: payload identical to the last one applied", router_name)
+            return "No configuration changes detected (identical to the last applied configuration)"
+    
+    try:
+        connect_params = _connection_params(device_info, router_name)
+    except ValueError as ve:
+        return f"Error: {ve}"
+    _LAST_APPLIED.pop(router_name, None)
+    return await _run_pyez(
+        router_name, _load_and_commit, connect_params, router_name, config_chunks, commit_comment, timeout, skip_diff,
+        payload_digest
+    )
+
+
 async def handle_load_and_commit_config(arguments: dict, context: Context) -> list[types.ContentBlock]:
     """Handler for load_and_commit_config tool"""
     router_name = arguments.get("router_name", "")
     config_text = arguments.get("config_text", "")
+    config_chunks = arguments.get("config_chunks") or []
     config_format = arguments.get("config_format", "set")
     commit_comment = arguments.get("commit_comment", "Configuration loaded via MCP")
     timeout = get_timeout_with_fallback(arguments.get("timeout"))
+    skip_diff = arguments.get("skip_diff", False)
+    
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
     
-    if router_name not in devices:
-        result = f"Router {router_name} not found in the device mapping."
+    log.debug("Loading and committing config on router %s with format %s", router_name, config_format)
+    
+    # config_text (if any) is loaded first, then each chunk, all before a single commit
+    if config_text:
+        config_chunks = [config_text, *config_chunks]
+    
+    fmt = config_format.lower()
+    if not config_chunks:
+        result = "Error: config_text or config_chunks is required"
+    elif fmt not in _CONFIG_FORMATS:
+        result = f"Error: Unsupported config format '{config_format}'. Use 'set', 'text', or 'xml'"
     else:
-        log.debug(f"Loading and committing config on router {router_name} with format {config_format}")
-        device_info = devices[router_name]
-        
-        try:
-            connect_params = prepare_connection_params(device_info, router_name)
-        except ValueError as ve:
-            result = f"Error: {ve}"
-        else:
-            try:
-                with Device(**connect_params) as junos_device:
-                    # Initialize configuration utility
-                    config_util = Config(junos_device)
-                    
-                    # Lock the configuration
-                    try:
-                        config_util.lock()
-                    except Exception as e:
-                        result = f"Failed to lock configuration: {e}"
-                    else:
-                        try:
-                            # Load the configuration based on format
-                            if config_format.lower() == "set":
-                                config_util.load(config_text, format='set')
-                            elif config_format.lower() == "text":
-                                config_util.load(config_text, format='text')
-                            elif config_format.lower() == "xml":
-                                config_util.load(config_text, format='xml')
-                            else:
-                                config_util.unlock()
-                                result = f"Error: Unsupported config format '{config_format}'. Use 'set', 'text', or 'xml'"
-                            
-                            if 'result' not in locals():
-                                # Check for differences
-                                diff = config_util.diff()
-                                if not diff:
-                                    config_util.unlock()
-                                    result = "No configuration changes detected"
-                                else:
-                                    # Commit the configuration
-                                    config_util.commit(comment=commit_comment, timeout=timeout)
-                                    config_util.unlock()
-                                    result = f"Configuration successfully loaded and committed on {router_name}. Changes:\n{diff}"
-                                    
-                        except Exception as e:
-                            # If anything fails, rollback and unlock
-                            try:
-                                config_util.rollback()
-                                config_util.unlock()
-                            except:
-                                pass
-                            result = f"Failed to load/commit configuration: {e}"
-                            
-            except ConnectError as ce:
-                result = f"Connection error to {router_name}: {ce}"
-            except Exception as e:
-                result = f"An error occurred: {e}"
+        result = await _commit_chunks(
+            device_info, router_name, [(chunk, fmt) for chunk in config_chunks], commit_comment, timeout, skip_diff
+        )
     
     content_block = types.TextContent(
         type="text",
@@ -1091,45 +1890,320 @@ async def handle_load_and_commit_config(arguments: dict, context: Context) -> li
     return [content_block]
 
 
+async def handle_load_and_commit_configs(arguments: dict, context: Context) -> list[types.ContentBlock]:
+    """Handler for load_and_commit_configs tool"""
+    router_name = arguments.get("router_name", "")
+    configs = arguments.get("configs") or []
+    commit_comment = arguments.get("commit_comment", "Configuration loaded via MCP")
+    timeout = get_timeout_with_fallback(arguments.get("timeout"))
+    skip_diff = arguments.get("skip_diff", False)
+    
+    device_info = devices.get(router_name)
+    if device_info is None:
+        return _router_not_found(router_name)
+    
+    log.debug("Loading and committing %d config chunk(s) on router %s", len(configs), router_name)
+    
+    config_chunks = []
+    error = None if configs else "Error: configs must be a non-empty list"
+    for config in configs:
+        chunk_format = config.get("format", "set")
+        fmt = chunk_format.lower()
+        if fmt not in _CONFIG_FORMATS:
+            error = f"Error: Unsupported config format '{chunk_format}'. Use 'set', 'text', or 'xml'"
+            break
+        config_chunks.append((config.get("text", ""), fmt))
+    
+    if error is not None:
+        result = error
+    else:
+        result = await _commit_chunks(device_info, router_name, config_chunks, commit_comment, timeout, skip_diff)
+    
+    content_block = types.TextContent(
+        type="text",
+        text=result,
+        annotations={"router_name": router_name, "configs": configs, "commit_comment": commit_comment}
+        )
+
+    return [content_block]
+
+
 # Tool registry mapping tool names to their handler functions
 # To add a new tool:
 # 1. Create an async handler function: async def handle_my_new_tool(arguments: dict) -> list[types.ContentBlock]
 # 2. Add it to this registry: "my_new_tool": handle_my_new_tool
-# 3. Add the tool definition to list_tools() method
+# 3. Add the tool definition to TOOL_DEFINITIONS
 TOOL_HANDLERS = {
     "execute_junos_command": handle_execute_junos_command,
+    "execute_junos_commands": handle_execute_junos_commands,
     "get_junos_config": handle_get_junos_config,
     "junos_config_diff": handle_junos_config_diff,
     "render_and_apply_j2_template": handle_render_and_apply_j2_template,
     "gather_device_facts": handle_gather_device_facts,
+    "gather_facts_bulk": handle_gather_facts_bulk,
+    "execute_junos_command_bulk": handle_execute_junos_command_bulk,
+    "execute_junos_command_multi": handle_execute_junos_command_multi,
     "get_router_list": handle_get_router_list,
     "load_and_commit_config": handle_load_and_commit_config,
+    "load_and_commit_configs": handle_load_and_commit_configs,
+    "invalidate_cache": handle_invalidate_cache,
     "add_device": handle_add_device     # Dynamic device management
 }
 
+# Tool definitions returned by list_tools(). Built once at import; the list is never mutated.
+TOOL_DEFINITIONS: list[types.Tool] = [
+    types.Tool(
+        name="execute_junos_command",
+        description="Execute a Junos command on the router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "command": {"type": "string", "description": "The command to execute on the router"},
+                "format": {"type": "string", "description": "Output format: text (CLI output), xml, or json (structured RPC output)", "default": "text"},
+                "max_output_chars": {"type": "integer", "description": "Optional: truncate output longer than this many characters (0 = no limit)", "default": 0},
+                "timeout": {"type": "integer", "description": "Command timeout in seconds", "default": 360}
+            },
+            "required": ["router_name", "command"]
+        }
+    ),
+    types.Tool(
+        name="execute_junos_commands",
+        description="Execute several Junos commands on the router over a single session; returns a JSON list of {command, output} objects in the order given",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "commands": {"type": "array", "items": {"type": "string"}, "description": "The commands to execute, in order"},
+                "format": {"type": "string", "description": "Output format: text (CLI output), xml, or json (structured RPC output)", "default": "text"},
+                "timeout": {"type": "integer", "description": "Per-command timeout in seconds", "default": 360}
+            },
+            "required": ["router_name", "commands"]
+        }
+    ),
+    types.Tool(
+        name="get_junos_config",
+        description="Get the configuration of the router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"}
+            },
+            "required": ["router_name"]
+        }
+    ),
+    types.Tool(
+        name="junos_config_diff",
+        description="Get the configuration diff against a rollback version",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "version": {"type": "integer", "description": "Rollback version to compare against (1-49)", "default": 1}
+            },
+            "required": ["router_name"]
+        }
+    ),
+    types.Tool(
+        name="render_and_apply_j2_template",
+        description="Render a Jinja2 template and apply it to the router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "template_content": {"type": "string", "description": "Jinja2 template to load"},
+                "vars_content": {"type": "string", "description": "YAML variables to load"},
+                "apply_config": {"type": "boolean", "description": "Boolean to apply or just render (default: False)"},
+                "dry_run": {"type": "boolean", "description": "Boolean to show diff without committing (default: False)"},
+                "commit_comment": {"type": "string", "description": "Commit comment", "default": "Configuration loaded via MCP"}
+            },
+            "required": ["template_content", "vars_content"]
+        }
+    ),
+    types.Tool(
+        name="gather_device_facts",
+        description="Gather Junos device facts from the router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "timeout": {"type": "integer", "description": "Connection timeout in seconds", "default": 360},
+                "force_refresh": {"type": "boolean", "description": f"Bypass the cached facts (cached for {_FACTS_TTL} seconds)", "default": False}
+            },
+            "required": ["router_name"]
+        }
+    ),
+    types.Tool(
+        name="gather_facts_bulk",
+        description="Gather Junos device facts from several routers concurrently; returns one result per router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_names": {"type": "array", "items": {"type": "string"}, "description": "The names of the routers"},
+                "timeout": {"type": "integer", "description": "Connection timeout in seconds", "default": 360},
+                "force_refresh": {"type": "boolean", "description": f"Bypass the cached facts (cached for {_FACTS_TTL} seconds)", "default": False}
+            },
+            "required": ["router_names"]
+        }
+    ),
+    types.Tool(
+        name="execute_junos_command_bulk",
+        description="Execute Junos commands on several routers concurrently; returns one result per router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "commands": {
+                    "type": "object",
+                    "additionalProperties": {"type": "string"},
+                    "description": "Mapping of router name to the command to execute on it"
+                },
+                "timeout": {"type": "integer", "description": "Command timeout in seconds", "default": 360}
+            },
+            "required": ["commands"]
+        }
+    ),
+    types.Tool(
+        name="execute_junos_command_multi",
+        description="Execute the same Junos command on several routers concurrently; returns one result per router (repeated router names run once)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_names": {"type": "array", "items": {"type": "string"}, "description": "The names of the routers"},
+                "command": {"type": "string", "description": "The command to execute on every router"},
+                "format": {"type": "string", "description": "Output format: text (CLI output), xml, or json (structured RPC output)", "default": "text"},
+                "max_output_chars": {"type": "integer", "description": "Optional: truncate each router's output longer than this many characters (0 = no limit)", "default": 0},
+                "timeout": {"type": "integer", "description": "Command timeout in seconds", "default": 360}
+            },
+            "required": ["router_names", "command"]
+        }
+    ),
+    types.Tool(
+        name="get_router_list",
+        description="Get list of available Junos routers",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="load_and_commit_config",
+        description="Load and commit configuration on a Junos router",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "config_text": {"type": "string", "description": "The configuration text to load"},
+                "config_chunks": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional: additional configuration chunks, loaded in order after config_text and committed once"
+                },
+                "config_format": {"type": "string", "description": "Format: set, text, or xml", "default": "set"},
+                "skip_diff": {"type": "boolean", "description": f"Commit without first fetching the candidate diff (saves a round-trip; the response omits the changes). Always creates a commit and rollback entry, even when nothing changed. A payload identical to the one this server last applied to the router within {_CONFIG_TTL} seconds is then reported unchanged without contacting the router", "default": False},
+                "commit_comment": {"type": "string", "description": "Commit comment", "default": "Configuration loaded via MCP"}
+            },
+            "required": ["router_name"]
+        }
+    ),
+    types.Tool(
+        name="load_and_commit_configs",
+        description="Load several configuration chunks (each with its own format) on a Junos router under one lock and commit them once",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router"},
+                "configs": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "text": {"type": "string", "description": "The configuration text to load"},
+                            "format": {"type": "string", "description": "Format: set, text, or xml", "default": "set"}
+                        },
+                        "required": ["text"]
+                    },
+                    "description": "Configuration chunks, loaded in order"
+                },
+                "skip_diff": {"type": "boolean", "description": f"Commit without first fetching the candidate diff (saves a round-trip; the response omits the changes). Always creates a commit and rollback entry, even when nothing changed. A payload identical to the one this server last applied to the router within {_CONFIG_TTL} seconds is then reported unchanged without contacting the router", "default": False},
+                "commit_comment": {"type": "string", "description": "Commit comment", "default": "Configuration loaded via MCP"}
+            },
+            "required": ["router_name", "configs"]
+        }
+    ),
+    types.Tool(
+        name="invalidate_cache",
+        description="Drop cached device facts and configuration so the next call fetches fresh data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "router_name": {"type": "string", "description": "The name of the router (omit to clear the cache for all routers)", "default": ""}
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="add_device",
+        description="Add a new Junos device with interactive elicitation for device details",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_name": {"type": "string", "description": "Device name/identifier", "default": ""},
+                "device_ip": {"type": "string", "description": "Device IP address", "default": ""},
+                "device_port": {"type": "integer", "description": "SSH port (default: 22)", "default": 0},
+                "username": {"type": "string", "description": "Username for authentication", "default": ""},
+                "ssh_key_path": {"type": "string", "description": "Path to SSH private key file", "default": ""}
+            },
+            "required": []
+        }
+    )
+]
+
+
+# Input validators compiled once per tool. The SDK's own validation calls jsonschema.validate,
+# which re-checks the schema and rebuilds a validator on every tool call.
+_TOOL_VALIDATORS = {}
+for _tool in TOOL_DEFINITIONS:
+    _validator_cls = jsonschema.validators.validator_for(_tool.inputSchema)
+    _validator_cls.check_schema(_tool.inputSchema)
+    _TOOL_VALIDATORS[_tool.name] = _validator_cls(_tool.inputSchema)
+
 
 def create_mcp_server() -> Server:
     """Create and configure the MCP server with all tools"""
     app = Server(JUNOS_MCP, version="1.0.0")
     
-    @app.call_tool()
+    # Bind the registry lookup once instead of resolving globals on every call
+    get_handler = TOOL_HANDLERS.get
+    
+    @app.call_tool(validate_input=False)
     async def call_tool(name: str, arguments: dict) -> list[types.ContentBlock]:
         """Handle tool calls using the tool registry"""
-        handler = TOOL_HANDLERS.get(name)
-        if handler:
-            try:
-                request_context = app.request_context
-                log.info(f"Got request_context: {type(request_context)}, session: {type(request_context.session) if request_context else None}")
-            except LookupError as e:
-                log.warning(f"LookupError getting request_context: {e}")
-                request_context = None
-            
-            context = Context(request_context=request_context, fastmcp=app)
-            log.info(f"Created context with request_context: {request_context is not None}")
-            
-            return await handler(arguments, context=context)
-        else:
+        handler = get_handler(name)
+        if handler is None:
             return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+        
+        # Raising here makes the SDK return an isError result, as its own validation does
+        error = jsonschema.exceptions.best_match(_TOOL_VALIDATORS[name].iter_errors(arguments))
+        if error is not None:
+            raise ValueError(f"Input validation error: {error.message}")
+        
+        # Use the interned device key, so the handlers' per-router dict lookups (devices,
+        # caches, locks, pool) compare by identity. Only known names are interned, so
+        # client input cannot grow the intern table.
+        router_name = arguments.get("router_name")
+        if isinstance(router_name, str) and router_name in devices:
+            arguments["router_name"] = sys.intern(router_name)
+        
+        # request_context raises LookupError (not AttributeError) outside a request
+        try:
+            request_context = app.request_context
+        except LookupError as e:
+            log.warning("LookupError getting request_context: %s", e)
+            request_context = None
+        
+        log.debug("Dispatching tool %s (request_context available: %s)", name, request_context is not None)
+        return await handler(arguments, context=Context(request_context=request_context, fastmcp=app))
 
     @app.list_resources()
     async def list_resources() -> list[types.Resource]:
@@ -1144,114 +2218,26 @@ def create_mcp_server() -> Server:
     @app.list_tools()
     async def list_tools() -> list[types.Tool]:
         """List available tools"""
-        return [
-            types.Tool(
-                name="execute_junos_command",
-                description="Execute a Junos command on the router",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"},
-                        "command": {"type": "string", "description": "The command to execute on the router"},
-                        "timeout": {"type": "integer", "description": "Command timeout in seconds", "default": 360}
-                    },
-                    "required": ["router_name", "command"]
-                }
-            ),
-            types.Tool(
-                name="get_junos_config",
-                description="Get the configuration of the router",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"}
-                    },
-                    "required": ["router_name"]
-                }
-            ),
-            types.Tool(
-                name="junos_config_diff",
-                description="Get the configuration diff against a rollback version",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"},
-                        "version": {"type": "integer", "description": "Rollback version to compare against (1-49)", "default": 1}
-                    },
-                    "required": ["router_name"]
-                }
-            ),
-            types.Tool(
-                name="render_and_apply_j2_template",
-                description="Render a Jinja2 template and apply it to the router",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"},
-                        "template_content": {"type": "string", "description": "Jinja2 template to load"},
-                        "vars_content": {"type": "string", "description": "YAML variables to load"},
-                        "apply_config": {"type": "boolean", "description": "Boolean to apply or just render (default: False)"},
-                        "dry_run": {"type": "boolean", "description": "Boolean to show diff without committing (default: False)"},
-                        "commit_comment": {"type": "string", "description": "Commit comment", "default": "Configuration loaded via MCP"}
-                    },
-                    "required": ["template_content", "vars_content"]
-                }
-            ),
-            types.Tool(
-                name="gather_device_facts",
-                description="Gather Junos device facts from the router",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"},
-                        "timeout": {"type": "integer", "description": "Connection timeout in seconds", "default": 360}
-                    },
-                    "required": ["router_name"]
-                }
-            ),
-            types.Tool(
-                name="get_router_list",
-                description="Get list of available Junos routers",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="load_and_commit_config",
-                description="Load and commit configuration on a Junos router",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "router_name": {"type": "string", "description": "The name of the router"},
-                        "config_text": {"type": "string", "description": "The configuration text to load"},
-                        "config_format": {"type": "string", "description": "Format: set, text, or xml", "default": "set"},
-                        "commit_comment": {"type": "string", "description": "Commit comment", "default": "Configuration loaded via MCP"}
-                    },
-                    "required": ["router_name", "config_text"]
-                }
-            ),
-            types.Tool(
-                name="add_device",
-                description="Add a new Junos device with interactive elicitation for device details",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "device_name": {"type": "string", "description": "Device name/identifier", "default": ""},
-                        "device_ip": {"type": "string", "description": "Device IP address", "default": ""},
-                        "device_port": {"type": "integer", "description": "SSH port (default: 22)", "default": 0},
-                        "username": {"type": "string", "description": "Username for authentication", "default": ""},
-                        "ssh_key_path": {"type": "string", "description": "Path to SSH private key file", "default": ""}
-                    },
-                    "required": []
-                }
-            )
-        ]
+        return TOOL_DEFINITIONS
 
     return app
 
 
+def _load_json_file(path: str) -> Any:
+    """Parse a JSON file with orjson, memory-mapping it to avoid an intermediate copy
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        orjson.JSONDecodeError: If the file is empty or not valid JSON
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file; let orjson report it as invalid JSON
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
 def main():
     # Create the parser
     parser = argparse.ArgumentParser(description="Junos MCP Server")
@@ -1271,36 +2257,36 @@ def main():
     auth_enabled = False
     if args.transport != 'stdio':
         # For non-stdio transports, check if we have tokens configured
-        if os.path.exists(".tokens"):
-            try:
-                with open(".tokens", 'r') as f:
-                    tokens = json.load(f)
-                    if tokens:  # If tokens exist, enable auth
-                        auth_enabled = True
-                        log.info("Token-based authentication enabled")
-                        log.info("Clients must send 'Authorization: Bearer <token>' header")
-                        log.info("Use jmcp_token_manager.py to manage tokens")
-                    else:
-                        log.warning("Empty .tokens file found - server is open to all clients")
-            except (json.JSONDecodeError, FileNotFoundError):
-                log.warning("Invalid .tokens file - server is open to all clients")
-        else:
+        try:
+            tokens = _load_json_file(".tokens")
+        except FileNotFoundError:
             log.warning("No .tokens file found - server is open to all clients")
             log.info("Create tokens using: python jmcp_token_manager.py generate --id <token-id>")
+        except orjson.JSONDecodeError:
+            log.warning("Invalid .tokens file - server is open to all clients")
+        else:
+            if tokens:  # If tokens exist, enable auth
+                auth_enabled = True
+                _refresh_tokens()
+                log.info("Token-based authentication enabled")
+                log.info("Clients must send 'Authorization: Bearer <token>' header")
+                log.info("Use jmcp_token_manager.py to manage tokens")
+            else:
+                log.warning("Empty .tokens file found - server is open to all clients")
     else:
         log.info("stdio transport - no authentication required")
     
     try:
-        with open(args.device_mapping, 'r') as f:
-            devices = json.load(f)
-            # Validate all device configurations
-            validate_all_devices(devices)
-            log.info(f"Successfully loaded and validated {len(devices)} device(s)")
+        devices = intern_device_names(_load_json_file(args.device_mapping))
+        # Validate all device configurations
+        devices = validate_all_devices(devices)
+        _prime_connection_params(devices)
+        log.info("Successfully loaded and validated %s device(s)", len(devices))
     except FileNotFoundError:
         print(f"File {args.device_mapping} not found.")
         devices = {}
         raise
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"File {args.device_mapping} is not a valid JSON file.")
         devices = {}
         raise
@@ -1311,6 +2297,7 @@ def main():
     # Set up signal handler for clean shutdown
     def signal_handler(sig, frame):
         print("\nShutting down MCP server...")
+        device_pool.close_all()
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -1355,7 +2342,7 @@ def main():
                 # Create Starlette app
                 async def lifespan(app):
                     async with session_manager.run():
-                        log.info(f"Streamable HTTP server started on http://{args.host}:{args.port}")
+                        log.info("Streamable HTTP server started on http://%s:%s", args.host, args.port)
                         yield
                         log.info("Server shutting down...")
                 
@@ -1365,20 +2352,23 @@ def main():
                     lifespan=lifespan
                 )
                 
-                # Run with uvicorn
-                import uvicorn
+                # Run with uvicorn; per-request access logging is off on this hot path
                 config = uvicorn.Config(
                     starlette_app,
                     host=args.host,
                     port=args.port,
-                    log_level="info"
+                    log_level="info",
+                    http="httptools",
+                    access_log=False
                 )
                 server = uvicorn.Server(config)
                 await server.serve()
             
-            anyio.run(run_streamable_http)
+            # server.serve() runs on anyio's loop, so uvloop is selected here rather than in uvicorn.Config
+            use_uvloop = importlib.util.find_spec("uvloop") is not None
+            anyio.run(run_streamable_http, backend_options={"use_uvloop": use_uvloop})
         else:
-            log.error(f"Unsupported transport: {args.transport}")
+            log.error("Unsupported transport: %s", args.transport)
             sys.exit(1)
             
     except KeyboardInterrupt:
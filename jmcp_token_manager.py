@@ -19,14 +19,16 @@
 ###
 
 import argparse
-import json
 import os
 import secrets
 import sys
+import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
+import orjson
+
 TOKENS_FILE = ".tokens"
 
 def generate_token() -> str:
@@ -36,19 +38,39 @@ def generate_token() -> str:
 
 def load_tokens() -> Dict[str, Any]:
     """Load tokens from file, return empty dict if file doesn't exist"""
-    if not os.path.exists(TOKENS_FILE):
-        return {}
-    
     try:
-        with open(TOKENS_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
+        with open(TOKENS_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, FileNotFoundError):
         return {}
 
+def load_token_index() -> Dict[str, str]:
+    """Load tokens and index them by token value (token -> token ID)"""
+    return {
+        token_data['token']: token_id
+        for token_id, token_data in load_tokens().items()
+        if 'token' in token_data
+    }
+
 def save_tokens(tokens: Dict[str, Any]) -> None:
-    """Save tokens to file"""
-    with open(TOKENS_FILE, 'w') as f:
-        json.dump(tokens, f, indent=2)
+    """Save tokens to file
+    
+    The file is written owner-only to a temporary path and renamed into place, so
+    a crash mid-write never leaves a truncated .tokens (which would load as no tokens).
+    mkstemp creates the temporary file exclusively (0600, a fresh random name, never
+    an existing file or symlink), so nothing planted next to .tokens is followed.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{TOKENS_FILE}.", suffix=".tmp",
+                                    dir=os.path.dirname(TOKENS_FILE) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(tokens, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, TOKENS_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 def generate_token_command(token_id: str, description: str = None) -> None:
     """Generate a new API token"""
@@ -81,15 +103,13 @@ def list_tokens_command() -> None:
         print("No tokens found")
         return
     
-    print(f"{'ID':<20} {'Description':<40} {'Created':<25}")
-    print("-" * 85)
-    
-    for token_id, token_data in tokens.items():
-        created = token_data.get('created', 'Unknown')
-        description = token_data.get('description', 'No description')
-        token_preview = token_data['token'][:12] + "..." if len(token_data['token']) > 12 else token_data['token']
-        
-        print(f"{token_id:<20} {description:<40} {created:<25}")
+    # Build the whole table and write it once instead of one print() per token
+    rows = [f"{'ID':<20} {'Description':<40} {'Created':<25}", "-" * 85]
+    rows.extend(
+        f"{token_id:<20} {token_data.get('description', 'No description'):<40} {token_data.get('created', 'Unknown'):<25}"
+        for token_id, token_data in tokens.items()
+    )
+    sys.stdout.write("\n".join(rows) + "\n")
 
 def revoke_token_command(token_id: str) -> None:
     """Revoke (delete) a token"""
@@ -120,13 +140,7 @@ def show_token_command(token_id: str) -> None:
 
 def validate_token(token: str) -> bool:
     """Validate if a token exists in the tokens file"""
-    tokens = load_tokens()
-    
-    for token_data in tokens.values():
-        if token_data['token'] == token:
-            return True
-    
-    return False
+    return token in load_token_index()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the bearer token middleware of the streamable-http transport
+"""
+import asyncio
+import sys
+
+import pytest
+
+import jmcp
+
+_TOKEN = "jmcp_" + "a" * 32
+_OTHER_TOKEN = "jmcp_" + "b" * 32
+
+
+@pytest.fixture(autouse=True)
+def tokens(write_tokens):
+    write_tokens({"client": {"token": _TOKEN}, "other": {"token": _OTHER_TOKEN}})
+    return write_tokens
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _status(middleware, headers=()):
+    """Send one GET through the middleware and return the response status"""
+    scope = {"type": "http", "method": "GET", "path": "/mcp", "headers": list(headers),
+             "client": ("127.0.0.1", 50000)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return messages[0]["status"]
+
+
+def _bearer(token):
+    return [(b"authorization", f"Bearer {token}".encode())]
+
+
+def test_missing_header_is_rejected():
+    assert _status(jmcp.BearerTokenMiddleware(_ok_app)) == 401
+
+
+def test_non_bearer_header_is_rejected():
+    assert _status(jmcp.BearerTokenMiddleware(_ok_app), [(b"authorization", b"Basic abc")]) == 401
+
+
+def test_wrong_token_is_rejected():
+    middleware = jmcp.BearerTokenMiddleware(_ok_app)
+    assert _status(middleware, _bearer("jmcp_" + "c" * 32)) == 401
+    assert _status(middleware, _bearer("short")) == 401
+
+
+def test_valid_token_passes():
+    assert _status(jmcp.BearerTokenMiddleware(_ok_app), _bearer(_TOKEN)) == 200
+
+
+def test_auth_disabled_passes_without_header():
+    assert _status(jmcp.BearerTokenMiddleware(_ok_app, auth_enabled=False)) == 200
+
+
+def test_revoked_token_is_rejected_after_cache_ttl(clock, tokens):
+    middleware = jmcp.BearerTokenMiddleware(_ok_app)
+    assert _status(middleware, _bearer(_TOKEN)) == 200
+
+    tokens({"other": {"token": _OTHER_TOKEN}})
+    clock.now += jmcp._TOKENS_RELOAD_INTERVAL
+    # Still trusted from the cache of recent successes
+    assert _status(middleware, _bearer(_TOKEN)) == 200
+
+    clock.now += middleware._CACHE_TTL
+    assert _status(middleware, _bearer(_TOKEN)) == 401
+    assert _status(middleware, _bearer(_OTHER_TOKEN)) == 200
+
+
+def _receiver(*messages):
+    """ASGI receive over a fixed message list; receiving past the end fails the test"""
+    queue = list(messages)
+
+    async def receive():
+        if not queue:
+            pytest.fail("receive() called after the last message")
+        return queue.pop(0)
+
+    return receive
+
+
+def _drain(replay, count):
+    async def drain():
+        return [await replay() for _ in range(count)]
+    return asyncio.run(drain())
+
+
+def test_logged_body_is_replayed_whole():
+    receive = _receiver(
+        {"type": "http.request", "body": b'{"a":', "more_body": True},
+        {"type": "http.request", "body": b' 1}', "more_body": False},
+    )
+    replay = asyncio.run(jmcp.BearerTokenMiddleware._log_body(receive))
+    assert _drain(replay, 1) == [{"type": "http.request", "body": b'{"a": 1}', "more_body": False}]
+
+
+def test_disconnect_while_logging_body_is_handed_back():
+    receive = _receiver(
+        {"type": "http.request", "body": b"partial", "more_body": True},
+        {"type": "http.disconnect"},
+    )
+    replay = asyncio.run(jmcp.BearerTokenMiddleware._log_body(receive))
+    assert _drain(replay, 2) == [
+        {"type": "http.request", "body": b"partial", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
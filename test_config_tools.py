@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for the configuration tools, run against a stand-in pooled device
+"""
+import asyncio
+import contextlib
+import sys
+
+import pytest
+from jnpr.junos.exception import ConnectError
+from jnpr.junos.rpcmeta import _RpcMetaExec
+from lxml import etree
+
+import jmcp
+
+_DEVICE = {"ip": "192.0.2.1", "port": 22, "username": "admin", "password": "secret"}
+
+
+class FakeJunos:
+    """Pooled Device stand-in: PyEZ's own RPC builder in front of a recording executor"""
+    hostname = "192.0.2.1"
+
+    def __init__(self):
+        self.timeout = 360
+        self.rpcs = []
+        self.reply = etree.XML("<configuration-text>system { host-name r1; }</configuration-text>")
+        self.rpc = _RpcMetaExec(self)
+        # Configuration session behaviour (see FakeConfig)
+        self.calls = []
+        self.candidate_diff = "[edit system]\n+  host-name r1;"
+        self.fail_on = None
+        self.connect_error = False
+
+    def execute(self, rpc, **kwargs):
+        self.rpcs.append(etree.tostring(rpc, encoding="unicode"))
+        return self.reply
+
+
+class FakeConfig:
+    """Config utility stand-in that records the load/diff/commit sequence on its device"""
+    def __init__(self, dev):
+        self.dev = dev
+
+    def _step(self, name):
+        self.dev.calls.append(name)
+        if self.dev.fail_on == name:
+            raise RuntimeError(f"{name} failed")
+
+    def lock(self):
+        self._step("lock")
+
+    def load(self, config, format):
+        self._step("load")
+
+    def diff(self):
+        self._step("diff")
+        return self.dev.candidate_diff
+
+    def commit(self, comment, timeout):
+        self._step("commit")
+
+    def unlock(self):
+        self._step("unlock")
+
+    def rollback(self):
+        self._step("rollback")
+
+
+@pytest.fixture
+def device(monkeypatch):
+    device = FakeJunos()
+
+    @contextlib.contextmanager
+    def checkout(router_name, connect_params):
+        if device.connect_error:
+            raise ConnectError(device)
+        yield device
+
+    monkeypatch.setattr(jmcp.device_pool, "checkout", checkout)
+    monkeypatch.setattr(jmcp, "Config", FakeConfig)
+    monkeypatch.setattr(jmcp, "devices", {"r1": dict(_DEVICE), "r2": dict(_DEVICE)})
+    for registry in ("_CONN_PARAMS", "_ROUTER_LOCKS", "_CONFIG_UTILS",
+                     "_CONFIG_CACHE", "_FACTS_CACHE", "_LAST_APPLIED"):
+        monkeypatch.setattr(jmcp, registry, {})
+    # Bound to the event loop that first uses it; every test runs its own loop
+    monkeypatch.setattr(jmcp, "_pyez_limiter", None)
+    return device
+
+
+def _call(handler, **arguments):
+    return asyncio.run(handler(arguments, None))
+
+
+def test_get_config_sends_attributes_not_a_filter(device):
+    blocks = _call(jmcp.handle_get_junos_config, router_name="r1")
+    assert device.rpcs == ['<get-configuration format="text" inherit="inherit"/>']
+    assert blocks[0].text == "system { host-name r1; }"
+
+
+def test_config_diff_sends_rollback_attributes(device):
+    device.reply = etree.XML(
+        "<configuration-information><configuration-output>[edit system]\n-  host-name r0;\n+  host-name r1;"
+        "</configuration-output></configuration-information>"
+    )
+    blocks = _call(jmcp.handle_junos_config_diff, router_name="r1", version=3)
+    assert device.rpcs == ['<get-configuration format="text" compare="rollback" rollback="3"/>']
+    assert blocks[0].text == "[edit system]\n-  host-name r0;\n+  host-name r1;"
+
+
+def test_empty_reply_is_empty_text(device):
+    device.reply = True
+    assert _call(jmcp.handle_junos_config_diff, router_name="r1")[0].text == ""
+
+
+def _seed_caches(*router_names):
+    """Mark facts and configuration as freshly cached for the given routers"""
+    now = jmcp.time.monotonic()
+    for router_name in router_names:
+        jmcp._FACTS_CACHE[router_name] = (now, "facts")
+        jmcp._CONFIG_CACHE[router_name] = (now, "config")
+
+
+def _load(**arguments):
+    return _call(jmcp.handle_load_and_commit_config, router_name="r1", config_text="set system host-name r1",
+                 **arguments)[0].text
+
+
+def test_config_is_cached_until_ttl(device, clock):
+    _call(jmcp.handle_get_junos_config, router_name="r1")
+    cached = _call(jmcp.handle_get_junos_config, router_name="r1")
+    assert len(device.rpcs) == 1
+    assert cached[0].annotations.cached
+
+    clock.now += jmcp._CONFIG_TTL
+    _call(jmcp.handle_get_junos_config, router_name="r1")
+    assert len(device.rpcs) == 2
+
+
+def test_config_error_is_not_cached(device):
+    device.connect_error = True
+    assert _call(jmcp.handle_get_junos_config, router_name="r1")[0].text.startswith("Connection error to r1")
+    assert "r1" not in jmcp._CONFIG_CACHE
+
+
+def test_commit_drops_cached_facts_and_config(device):
+    _seed_caches("r1", "r2")
+    assert _load().startswith("Configuration successfully loaded and committed on r1")
+    assert "r1" not in jmcp._FACTS_CACHE and "r1" not in jmcp._CONFIG_CACHE
+    assert "r2" in jmcp._FACTS_CACHE and "r2" in jmcp._CONFIG_CACHE
+
+
+def test_failed_commit_drops_cached_facts_and_config(device):
+    _seed_caches("r1")
+    device.fail_on = "commit"
+    assert _load().startswith("Failed to load/commit configuration")
+    assert "rollback" in device.calls
+    assert "r1" not in jmcp._FACTS_CACHE and "r1" not in jmcp._CONFIG_CACHE
+
+
+def test_connect_error_drops_cached_facts_and_config(device):
+    _seed_caches("r1")
+    device.connect_error = True
+    assert _load().startswith("Connection error to r1")
+    assert "r1" not in jmcp._FACTS_CACHE and "r1" not in jmcp._CONFIG_CACHE
+
+
+def test_unchanged_load_keeps_cached_config(device):
+    _seed_caches("r1")
+    device.candidate_diff = None
+    assert _load() == "No configuration changes detected"
+    assert "commit" not in device.calls
+    assert "r1" in jmcp._CONFIG_CACHE
+
+
+def test_load_diffs_before_committing(device):
+    assert _load().endswith("Changes:\n[edit system]\n+  host-name r1;")
+    assert device.calls == ["lock", "load", "diff", "commit", "unlock"]
+
+
+def test_load_without_changes_is_not_committed(device):
+    device.candidate_diff = None
+    assert _load() == "No configuration changes detected"
+    assert device.calls == ["lock", "load", "diff", "unlock"]
+
+
+def test_skip_diff_always_commits_and_says_so(device):
+    device.candidate_diff = None
+    result = _load(skip_diff=True)
+    assert device.calls == ["lock", "load", "commit", "unlock"]
+    assert result == ("Configuration successfully loaded and committed on r1"
+                      " (diff skipped: a commit was created whether or not anything changed)")
+
+
+def test_invalidate_cache_for_one_router(device):
+    _seed_caches("r1", "r2")
+    assert _call(jmcp.handle_invalidate_cache, router_name="r1")[0].text == "Cache cleared for r1"
+    assert "r1" not in jmcp._FACTS_CACHE and "r1" not in jmcp._CONFIG_CACHE
+    assert "r2" in jmcp._FACTS_CACHE and "r2" in jmcp._CONFIG_CACHE
+    assert _call(jmcp.handle_invalidate_cache, router_name="r1")[0].text == "Cache was already empty for r1"
+
+
+def test_invalidate_cache_for_all_routers(device):
+    _seed_caches("r1", "r2")
+    jmcp._LAST_APPLIED["r2"] = (jmcp.time.monotonic(), b"digest")
+    assert _call(jmcp.handle_invalidate_cache)[0].text == "Cache cleared for all routers"
+    assert not jmcp._FACTS_CACHE and not jmcp._CONFIG_CACHE and not jmcp._LAST_APPLIED
+
+
+_SKIPPED = "No configuration changes detected (identical to the last applied configuration)"
+
+
+def _sessions(device):
+    """Number of load sequences that reached the router"""
+    return device.calls.count("lock")
+
+
+def test_identical_skip_diff_payload_within_ttl_skips_router(device, clock):
+    _load(skip_diff=True)
+    clock.now += jmcp._CONFIG_TTL - 1
+    assert _load(skip_diff=True) == _SKIPPED
+    assert _sessions(device) == 1
+
+
+def test_identical_payload_without_skip_diff_goes_to_router(device):
+    _load(skip_diff=True)
+    device.candidate_diff = None
+    assert _load() == "No configuration changes detected"
+    assert _sessions(device) == 2
+
+
+def test_different_payload_goes_to_router(device):
+    _load(skip_diff=True)
+    _load(skip_diff=True, config_chunks=["set system domain-name example.net"])
+    assert _sessions(device) == 2
+
+
+def test_expired_entry_goes_to_router(device, clock):
+    _load(skip_diff=True)
+    clock.now += jmcp._CONFIG_TTL
+    assert _load(skip_diff=True) != _SKIPPED
+    assert _sessions(device) == 2
+
+
+def test_failed_commit_forgets_last_payload(device):
+    _load(skip_diff=True)
+    device.fail_on = "commit"
+    _load(skip_diff=True, config_chunks=["set system domain-name example.net"])
+    assert "r1" not in jmcp._LAST_APPLIED
+    device.fail_on = None
+    assert _load(skip_diff=True) != _SKIPPED
+    assert _sessions(device) == 3
+
+
+@pytest.mark.parametrize("arguments", [{"router_name": "r1"}, {}], ids=["one-router", "all-routers"])
+def test_cache_flush_forgets_last_payload(device, arguments):
+    _load(skip_diff=True)
+    _call(jmcp.handle_invalidate_cache, **arguments)
+    assert _load(skip_diff=True) != _SKIPPED
+    assert _sessions(device) == 2
+
+
+def test_payload_digest_frames_chunks():
+    """Splitting the same text differently, or changing a chunk's format, is a different payload"""
+    digest = jmcp._payload_digest
+    assert digest([("ab", "set")]) == digest([("ab", "set")])
+    assert digest([("ab", "set")]) != digest([("a", "set"), ("b", "set")])
+    assert digest([("ab", "set")]) != digest([("ab", "text")])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -1,242 +1,211 @@
 #!/usr/bin/env python3
 """
-Test script for device configuration validation
+Tests for device configuration validation
 """
-import json
 import sys
-from utils.config import validate_device_config, validate_all_devices
-
-def test_valid_config():
-    """Test a valid configuration"""
-    print("\n=== Testing Valid Configuration ===")
-    valid_config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "password",
-                "password": "secret123"
-            }
+
+import pytest
+
+from utils.config import validate_all_devices
+
+_VALID = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "password",
+            "password": "secret123"
         }
     }
-    
-    try:
-        validate_all_devices(valid_config)
-        print("✅ Valid configuration passed validation")
-    except ValueError as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
-    return True
-
-def test_missing_ip():
-    """Test configuration missing IP field"""
-    print("\n=== Testing Missing IP Field ===")
-    config = {
-        "router1": {
-            # Missing "ip" field
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "password",
-                "password": "secret123"
-            }
+}
+
+_MISSING_IP = {
+    "router1": {
+        # Missing "ip" field
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "password",
+            "password": "secret123"
         }
     }
-    
-    try:
-        validate_all_devices(config)
-        print("❌ Should have failed for missing IP")
-        return False
-    except ValueError as e:
-        print(f"✅ Correctly caught error: {e}")
-        return True
-
-def test_missing_auth():
-    """Test configuration missing authentication"""
-    print("\n=== Testing Missing Authentication ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin"
-            # Missing auth section and password field
-        }
+}
+
+_MISSING_AUTH = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin"
+        # Missing auth section and password field
     }
-    
-    try:
-        validate_all_devices(config)
-        print("❌ Should have failed for missing auth")
-        return False
-    except ValueError as e:
-        print(f"✅ Correctly caught error: {e}")
-        return True
-
-def test_invalid_auth_type():
-    """Test configuration with invalid auth type"""
-    print("\n=== Testing Invalid Auth Type ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "invalid_type",
-                "password": "secret123"
-            }
+}
+
+_INVALID_AUTH_TYPE = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "invalid_type",
+            "password": "secret123"
         }
     }
-    
-    try:
-        validate_all_devices(config)
-        print("❌ Should have failed for invalid auth type")
-        return False
-    except ValueError as e:
-        print(f"✅ Correctly caught error: {e}")
-        return True
-
-def test_ssh_key_missing_path():
-    """Test SSH key auth missing private_key_path"""
-    print("\n=== Testing SSH Key Auth Missing Path ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "ssh_key"
-                # Missing private_key_path
-            }
+}
+
+_SSH_KEY_MISSING_PATH = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "ssh_key"
+            # Missing private_key_path
         }
     }
-    
-    try:
-        validate_all_devices(config)
-        print("❌ Should have failed for missing SSH key path")
-        return False
-    except ValueError as e:
-        print(f"✅ Correctly caught error: {e}")
-        return True
-
-def test_invalid_port_type():
-    """Test configuration with invalid port type"""
-    print("\n=== Testing Invalid Port Type ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": "22",  # Should be int, not string
-            "username": "admin",
-            "auth": {
-                "type": "password",
-                "password": "secret123"
-            }
+}
+
+_INVALID_PORT_TYPE = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": "22",  # Should be int, not string
+        "username": "admin",
+        "auth": {
+            "type": "password",
+            "password": "secret123"
         }
     }
-    
-    try:
-        validate_all_devices(config)
-        print("❌ Should have failed for invalid port type")
-        return False
-    except ValueError as e:
-        print(f"✅ Correctly caught error: {e}")
-        return True
-
-def test_backward_compatibility():
-    """Test backward compatibility with old password format"""
-    print("\n=== Testing Backward Compatibility ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin",
-            "password": "secret123"  # Old format
+}
+
+_INVALID_IP = {
+    "router1": {
+        "ip": "192.168.1.300",  # Not an address, and not a host name either
+        "port": 22,
+        "username": "admin",
+        "password": "secret123"
+    }
+}
+
+_HOSTNAME_IP = {
+    "router1": {
+        "ip": "router.example.com",  # Host names are accepted in the 'ip' field
+        "port": 22,
+        "username": "admin",
+        "password": "secret123"
+    }
+}
+
+_UNDERSCORE_HOSTNAME_IP = {
+    "router1": {
+        "ip": "core_rtr1.lab",  # ssh_config aliases often use underscores
+        "port": 22,
+        "username": "admin",
+        "password": "secret123"
+    }
+}
+
+_LEGACY_PASSWORD = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin",
+        "password": "secret123"  # Old format
+    }
+}
+
+_MIXED_DEVICES = {
+    "router1": {
+        "ip": "192.168.1.1",
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "password",
+            "password": "secret123"
         }
+    },
+    "router2": {
+        # Missing IP
+        "port": 22,
+        "username": "admin",
+        "auth": {
+            "type": "ssh_key",
+            "private_key_path": "/path/to/key"
+        }
+    },
+    "router3": {
+        "ip": "192.168.1.3",
+        "port": "invalid",  # Invalid port type
+        "username": "admin",
+        "password": "secret"
     }
-    
-    try:
+}
+
+
+@pytest.mark.parametrize("config,ok", [
+    pytest.param(_VALID, True, id="valid"),
+    pytest.param(_MISSING_IP, False, id="missing-ip"),
+    pytest.param(_MISSING_AUTH, False, id="missing-auth"),
+    pytest.param(_INVALID_AUTH_TYPE, False, id="invalid-auth-type"),
+    pytest.param(_SSH_KEY_MISSING_PATH, False, id="ssh-key-missing-path"),
+    pytest.param(_INVALID_PORT_TYPE, False, id="invalid-port-type"),
+    pytest.param(_INVALID_IP, False, id="invalid-ip"),
+    pytest.param(_HOSTNAME_IP, True, id="hostname-ip"),
+    pytest.param(_UNDERSCORE_HOSTNAME_IP, True, id="underscore-hostname-ip"),
+    pytest.param(_LEGACY_PASSWORD, True, id="backward-compatibility"),
+])
+def test_validate(config, ok):
+    if ok:
         validate_all_devices(config)
-        print("✅ Backward compatible configuration passed validation")
-    except ValueError as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
-    return True
+    else:
+        with pytest.raises(ValueError):
+            validate_all_devices(config)
+
+
+@pytest.mark.parametrize("port", [0, -1, 65536, 70000])
+def test_port_out_of_range(port):
+    config = {"router1": {**_LEGACY_PASSWORD["router1"], "port": port}}
+    with pytest.raises(ValueError, match="Expected 1-65535"):
+        validate_all_devices(config)
+
 
 def test_multiple_devices():
-    """Test multiple devices with mixed valid and invalid configs"""
-    print("\n=== Testing Multiple Devices ===")
-    config = {
-        "router1": {
-            "ip": "192.168.1.1",
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "password",
-                "password": "secret123"
-            }
-        },
-        "router2": {
-            # Missing IP
-            "port": 22,
-            "username": "admin",
-            "auth": {
-                "type": "ssh_key",
-                "private_key_path": "/path/to/key"
-            }
-        },
-        "router3": {
-            "ip": "192.168.1.3",
-            "port": "invalid",  # Invalid port type
-            "username": "admin",
-            "password": "secret"
-        }
-    }
-    
-    try:
+    """Every invalid device is reported, not just the first"""
+    with pytest.raises(ValueError) as excinfo:
+        validate_all_devices(_MIXED_DEVICES)
+    message = str(excinfo.value)
+    assert "router2" in message
+    assert "router3" in message
+    assert "router1" not in message
+
+
+def test_validate_all_devices_returns_frozen_copies():
+    """The caller's configs are left alone; the returned copies are read-only"""
+    config = {"router1": {**_VALID["router1"], "auth": dict(_VALID["router1"]["auth"])}}
+    frozen = validate_all_devices(config)
+    assert type(config["router1"]) is dict
+    assert type(config["router1"]["auth"]) is dict
+    assert frozen["router1"] == config["router1"]
+    with pytest.raises(TypeError):
+        frozen["router1"]["port"] = 23
+    with pytest.raises(TypeError):
+        frozen["router1"]["auth"]["password"] = "changed"
+
+
+def test_edited_config_is_revalidated():
+    """A plain dict edited after passing validation is checked again, not remembered"""
+    config = {"router1": {**_VALID["router1"], "auth": dict(_VALID["router1"]["auth"])}}
+    validate_all_devices(config)
+    config["router1"]["port"] = "x"
+    with pytest.raises(ValueError):
         validate_all_devices(config)
-        print("❌ Should have failed for invalid devices")
-        return False
-    except ValueError as e:
-        error_str = str(e)
-        print(f"✅ Correctly caught errors:\n{error_str}")
-        # Check that both errors are reported
-        if "router2" in error_str and "router3" in error_str:
-            print("✅ All invalid devices reported")
-            return True
-        else:
-            print("❌ Not all invalid devices were reported")
-            return False
-
-def main():
-    """Run all tests"""
-    print("=" * 60)
-    print("Device Configuration Validation Tests")
-    print("=" * 60)
-    
-    tests = [
-        test_valid_config,
-        test_missing_ip,
-        test_missing_auth,
-        test_invalid_auth_type,
-        test_ssh_key_missing_path,
-        test_invalid_port_type,
-        test_backward_compatibility,
-        test_multiple_devices
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        if test():
-            passed += 1
-        else:
-            failed += 1
-    
-    print("\n" + "=" * 60)
-    print(f"Test Results: {passed} passed, {failed} failed")
-    print("=" * 60)
-    
-    return 0 if failed == 0 else 1
+
+
+def test_frozen_copy_revalidates():
+    """Copies from an earlier call still validate once the memo has moved on"""
+    frozen = validate_all_devices(_VALID)
+    validate_all_devices(_LEGACY_PASSWORD)
+    assert validate_all_devices(frozen) == frozen
+
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))
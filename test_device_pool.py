@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent device connection pool
+"""
+import sys
+
+import pytest
+from jnpr.junos.exception import ConnectError
+
+import utils.device_pool as device_pool
+from utils.device_pool import DevicePool
+
+
+class FakeDevice:
+    """Stand-in for jnpr.junos.Device that records what the pool does with it"""
+    opened = []
+
+    def __init__(self, **params):
+        self.params = params
+        self.connected = False
+        self.timeout = params.get('timeout', 360)
+        self.probe_timeouts = []
+        self.probe_fails = False
+        self.rpc = self
+        FakeDevice.opened.append(self)
+
+    def open(self):
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    def get_system_uptime_information(self):
+        self.probe_timeouts.append(self.timeout)
+        if self.probe_fails:
+            raise ConnectError(self)
+
+
+@pytest.fixture(autouse=True)
+def fake_device(monkeypatch):
+    FakeDevice.opened = []
+    monkeypatch.setattr(device_pool, 'Device', FakeDevice)
+
+
+def _age(pool, router_name, seconds):
+    """Pretend the router's session was last used `seconds` ago"""
+    pool._entries[router_name].last_used -= seconds
+
+
+def test_session_is_reused():
+    pool = DevicePool()
+    with pool.checkout('r1', {'host': 'h'}) as first:
+        pass
+    with pool.checkout('r1', {'host': 'h'}) as second:
+        pass
+    assert first is second
+    assert len(FakeDevice.opened) == 1
+
+
+def test_disconnected_session_is_reopened():
+    pool = DevicePool()
+    with pool.checkout('r1', {}) as first:
+        first.connected = False
+    with pool.checkout('r1', {}) as second:
+        pass
+    assert second is not first
+    assert second.connected
+
+
+def test_connect_error_drops_session():
+    pool = DevicePool()
+    with pytest.raises(ConnectError):
+        with pool.checkout('r1', {}) as device:
+            raise ConnectError(device)
+    assert pool._entries['r1'].device is None
+    assert not device.connected
+
+
+def test_idle_sessions_are_closed():
+    pool = DevicePool(idle_timeout=10)
+    with pool.checkout('r1', {}) as device:
+        pass
+    _age(pool, 'r1', 11)
+    pool.close_idle()
+    assert not device.connected
+    assert pool._entries['r1'].device is None
+
+
+def test_health_check_uses_short_timeout_and_restores_it():
+    pool = DevicePool(health_check_after=30, probe_timeout=5)
+    with pool.checkout('r1', {}) as device:
+        device.timeout = 360
+    _age(pool, 'r1', 31)
+    with pool.checkout('r1', {}) as again:
+        pass
+    assert again is device
+    assert device.probe_timeouts == [5]
+    assert device.timeout == 360
+
+
+def test_failed_health_check_reopens_session():
+    pool = DevicePool(health_check_after=30)
+    with pool.checkout('r1', {}) as device:
+        device.probe_fails = True
+    _age(pool, 'r1', 31)
+    with pool.checkout('r1', {}) as replacement:
+        pass
+    assert replacement is not device
+    assert not device.connected
+
+
+def test_recent_session_is_not_probed():
+    pool = DevicePool(health_check_after=30)
+    with pool.checkout('r1', {}) as device:
+        pass
+    with pool.checkout('r1', {}):
+        pass
+    assert device.probe_timeouts == []
+
+
+def test_close_all():
+    pool = DevicePool()
+    with pool.checkout('r1', {}) as d1:
+        pass
+    with pool.checkout('r2', {}) as d2:
+        pass
+    pool.close_all()
+    assert not d1.connected and not d2.connected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
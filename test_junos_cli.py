@@ -4,12 +4,17 @@ Test script for _run_junos_cli_command() function
 This allows testing Junos commands without setting up the full MCP server
 """
 
+import argparse
+import functools
+import os
 import sys
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the functions directly from jmcp
 import jmcp
+from utils.config import intern_device_names, validate_all_devices
 
 # Setup logging
 logging.basicConfig(
@@ -19,24 +24,106 @@ logging.basicConfig(
 log = logging.getLogger('test-junos-cli')
 
 
+# (path, mtime_ns, size) -> parsed devices, so reloading an unchanged file is free
+_DEVICES_CACHE: dict[tuple, dict] = {}
+
+
 def load_devices(devices_file: str) -> bool:
     """Load devices configuration from JSON file"""
     try:
-        with open(devices_file, 'r') as f:
-            jmcp.devices = json.load(f)
-            log.info(f"Loaded {len(jmcp.devices)} device(s) from {devices_file}")
-            for name in jmcp.devices.keys():
-                log.info(f"  - {name}")
-            return True
+        st = os.stat(devices_file)
+        key = (devices_file, st.st_mtime_ns, st.st_size)
+        cached = _DEVICES_CACHE.get(key)
+        if cached is not None:
+            jmcp.devices = cached
+        else:
+            # Same (orjson) loader the server uses; its JSONDecodeError subclasses json's
+            devices = intern_device_names(jmcp._load_json_file(devices_file))
+            # Validated and primed as at server startup; only a valid file is cached
+            jmcp.devices = validate_all_devices(devices)
+            jmcp._prime_connection_params(jmcp.devices)
+            _DEVICES_CACHE.clear()
+            _DEVICES_CACHE[key] = jmcp.devices
+        log.info("Loaded %s device(s) from %s", len(jmcp.devices), devices_file)
+        for name in jmcp.devices.keys():
+            log.info("  - %s", name)
+        return True
     except FileNotFoundError:
-        log.error(f"Device file not found: {devices_file}")
+        log.error("Device file not found: %s", devices_file)
         return False
     except json.JSONDecodeError as e:
-        log.error(f"Invalid JSON in device file: {e}")
+        log.error("Invalid JSON in device file: %s", e)
+        return False
+    except ValueError as e:
+        log.error("Invalid device configuration: %s", e)
         return False
     except Exception as e:
-        log.error(f"Error loading device file: {e}")
+        log.error("Error loading device file: %s", e)
+        return False
+
+
+def _run_on_router(router_name: str, command: str, timeout: int = 360) -> str:
+    """Look up a router and run a command through jmcp._run_junos_cli_command"""
+    device_info = jmcp.devices.get(router_name)
+    if device_info is None:
+        return f"Router {router_name} not found in the device mapping."
+    return jmcp._run_junos_cli_command(device_info, router_name, command, timeout)
+
+
+def _print_help(parts: list[str]) -> bool:
+    if len(parts) != 1:
+        return False
+    print("\nAvailable commands:")
+    print("  list                - List all configured routers")
+    print("  test <router>       - Test connection to a router")
+    print("  exec <router> <cmd> - Execute command on router")
+    print("  help                - Show this help")
+    print("  quit/exit           - Exit the program\n")
+    return True
+
+
+def _list_routers(parts: list[str]) -> bool:
+    if len(parts) != 1:
+        return False
+    if not jmcp.devices:
+        print("No devices loaded")
+    else:
+        print("\nConfigured routers:")
+        for name, info in jmcp.devices.items():
+            print(f"  - {name} ({info['ip']}:{info.get('port', 22)})")
+    print()
+    return True
+
+
+def _test_router(parts: list[str]) -> bool:
+    if len(parts) < 2:
+        return False
+    router = parts[1]
+    print(f"Testing connection to {router}...")
+    result = _run_on_router(router, "show version | match Hostname", timeout=30)
+    print(result)
+    return True
+
+
+def _exec_on_router(parts: list[str]) -> bool:
+    if len(parts) < 3:
         return False
+    router = parts[1]
+    command = parts[2]
+    print(f"Executing on {router}: {command}")
+    result = _run_on_router(router, command)
+    print("\nResult:")
+    print(result)
+    return True
+
+
+# Interactive command -> handler; a handler returns False if the arguments don't fit
+_INTERACTIVE_COMMANDS = {
+    'help': _print_help,
+    'list': _list_routers,
+    'test': _test_router,
+    'exec': _exec_on_router,
+}
 
 
 def interactive_mode():
@@ -51,46 +138,16 @@ def interactive_mode():
             
             if not user_input:
                 continue
+            
+            parts = user_input.split(None, 2)
+            head = parts[0].lower()
                 
-            if user_input.lower() in ['quit', 'exit']:
+            if head in ('quit', 'exit') and len(parts) == 1:
                 print("Goodbye!")
                 break
-                
-            if user_input.lower() == 'help':
-                print("\nAvailable commands:")
-                print("  list                - List all configured routers")
-                print("  test <router>       - Test connection to a router")
-                print("  exec <router> <cmd> - Execute command on router")
-                print("  help                - Show this help")
-                print("  quit/exit           - Exit the program\n")
-                continue
-                
-            if user_input.lower() == 'list':
-                if not jmcp.devices:
-                    print("No devices loaded")
-                else:
-                    print("\nConfigured routers:")
-                    for name, info in jmcp.devices.items():
-                        print(f"  - {name} ({info['ip']}:{info.get('port', 22)})")
-                print()
-                continue
-                
-            parts = user_input.split(None, 2)
             
-            if parts[0].lower() == 'test' and len(parts) >= 2:
-                router = parts[1]
-                print(f"Testing connection to {router}...")
-                result = jmcp._run_junos_cli_command(router, "show version | match Hostname", timeout=30)
-                print(result)
-                continue
-                
-            if parts[0].lower() == 'exec' and len(parts) >= 3:
-                router = parts[1]
-                command = parts[2]
-                print(f"Executing on {router}: {command}")
-                result = jmcp._run_junos_cli_command(router, command)
-                print("\nResult:")
-                print(result)
+            handler = _INTERACTIVE_COMMANDS.get(head)
+            if handler is not None and handler(parts):
                 continue
                 
             print(f"Unknown command: {user_input}")
@@ -100,13 +157,12 @@ def interactive_mode():
             print("\nUse 'quit' or 'exit' to leave")
             continue
         except Exception as e:
-            log.error(f"Error: {e}")
+            log.error("Error: %s", e)
 
 
-def main():
-    """Main function for testing _run_junos_cli_command"""
-    import argparse
-    
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser (once per process)"""
     parser = argparse.ArgumentParser(
         description='Test Junos CLI commands without MCP server',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -161,51 +217,70 @@ Examples:
         help='Enable verbose logging'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def run(file: str, router: str | None = None, command: str | None = None, test_all: bool = False,
+        timeout: int = 360, verbose: bool = False) -> int:
+    """Load devices and run the requested mode; callable without going through argparse
+    
+    Returns:
+        Process exit status
     
+    Raises:
+        ValueError: If only one of router and command is given (and test_all is not set)
+    """
     # Set logging level
-    if args.verbose:
+    if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
         jmcp.log.setLevel(logging.DEBUG)
         log.setLevel(logging.DEBUG)
     
     # Load devices
-    if not load_devices(args.file):
-        sys.exit(1)
+    if not load_devices(file):
+        return 1
     
     # Test all devices mode
-    if args.test_all:
+    if test_all:
         print("\nTesting all devices...")
-        for router_name in jmcp.devices.keys():
-            print(f"\n--- Testing {router_name} ---")
-            result = jmcp._run_junos_cli_command(
-                router_name, 
-                "show version | match Hostname", 
-                timeout=30
+        router_names = list(jmcp.devices)
+        # Each router has its own pooled session, so the SSH round-trips can overlap
+        with ThreadPoolExecutor(max_workers=max(1, min(jmcp._BULK_CONCURRENCY, len(router_names)))) as executor:
+            results = executor.map(
+                lambda name: _run_on_router(name, "show version | match Hostname", timeout=30),
+                router_names
             )
-            print(result)
-        sys.exit(0)
+            for router_name, result in zip(router_names, results):
+                print(f"\n--- Testing {router_name} ---")
+                print(result)
+        return 0
     
     # Single command mode
-    if args.router and args.command:
-        print(f"\nExecuting command on {args.router}...")
-        result = jmcp._run_junos_cli_command(
-            args.router,
-            args.command,
-            timeout=args.timeout
-        )
+    if router and command:
+        print(f"\nExecuting command on {router}...")
+        result = _run_on_router(router, command, timeout=timeout)
         print("\nResult:")
         print(result)
-        sys.exit(0)
+        return 0
     
-    # Interactive mode
-    if not args.router and not args.command:
-        interactive_mode()
-        sys.exit(0)
+    if router or command:
+        raise ValueError("Please specify both --router and --command, or use interactive mode")
     
-    # Invalid arguments
-    parser.error("Please specify both --router and --command, or use interactive mode")
+    # Interactive mode
+    interactive_mode()
+    return 0
+
+
+def main():
+    """Main function for testing _run_junos_cli_command"""
+    parser = _get_parser()
+    args = parser.parse_args()
+    try:
+        sys.exit(run(**vars(args)))
+    except ValueError as e:
+        # Invalid arguments
+        parser.error(str(e))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
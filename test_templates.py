@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Tests for template variable parsing and template compilation
+"""
+import sys
+
+import pytest
+
+import jmcp
+
+
+def test_parsed_vars_are_not_shared():
+    """A template mutating its variables must not change later renders"""
+    vars_content = "interfaces:\n  - ge-0/0/0\nsettings:\n  mtu: 9192\n"
+    first = jmcp._parse_vars(vars_content)
+    jmcp._compile_template(
+        "{% set _ = interfaces.append('ge-0/0/1') %}{% set _ = settings.update(mtu=1500) %}"
+    ).render(**first)
+    assert first["interfaces"] == ["ge-0/0/0", "ge-0/0/1"]
+
+    second = jmcp._parse_vars(vars_content)
+    assert second == {"interfaces": ["ge-0/0/0"], "settings": {"mtu": 9192}}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
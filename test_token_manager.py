@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for writing the .tokens file
+"""
+import os
+import stat
+import sys
+
+import pytest
+
+import jmcp_token_manager
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _mode(path):
+    return stat.S_IMODE(os.lstat(path).st_mode)
+
+
+def test_saved_file_is_owner_only_and_replaces_existing(workdir):
+    (workdir / ".tokens").write_text("{}")
+    os.chmod(".tokens", 0o644)
+    jmcp_token_manager.save_tokens({"client": {"token": "jmcp_x"}})
+    assert _mode(".tokens") == 0o600
+    assert jmcp_token_manager.load_tokens() == {"client": {"token": "jmcp_x"}}
+    assert os.listdir(workdir) == [".tokens"]
+
+
+def test_planted_temp_path_is_not_followed(workdir):
+    """A file or symlink at the old fixed temp name is left alone"""
+    victim = workdir / "victim"
+    victim.write_text("keep")
+    os.chmod(victim, 0o644)
+    os.symlink(victim, ".tokens.tmp")
+    jmcp_token_manager.save_tokens({"client": {"token": "jmcp_x"}})
+    assert victim.read_text() == "keep"
+    assert _mode(victim) == 0o644
+    assert os.path.islink(".tokens.tmp")
+    assert _mode(".tokens") == 0o600
+
+
+def test_failed_write_leaves_no_temp_file(workdir, monkeypatch):
+    def replace(src, dst):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(jmcp_token_manager.os, "replace", replace)
+    with pytest.raises(OSError):
+        jmcp_token_manager.save_tokens({})
+    assert os.listdir(workdir) == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
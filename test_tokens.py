@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the server's index of valid .tokens entries
+"""
+import os
+import sys
+
+import pytest
+
+import jmcp
+
+_TOKEN = "jmcp_" + "a" * 32
+
+
+@pytest.fixture(autouse=True)
+def tokens(write_tokens):
+    write_tokens({"client": {"token": _TOKEN, "description": "test"}})
+    return write_tokens
+
+
+def test_known_token_maps_to_its_id():
+    assert jmcp.token_id_from_file(_TOKEN) == "client"
+    assert jmcp.validate_token_from_file(_TOKEN)
+
+
+def test_unknown_token_of_same_length_is_rejected():
+    assert jmcp.token_id_from_file("jmcp_" + "b" * 32) is None
+
+
+def test_token_of_other_length_is_rejected_before_hashing(monkeypatch):
+    jmcp.token_id_from_file(_TOKEN)  # load the index
+    monkeypatch.setattr(jmcp, "_token_digest", lambda token: pytest.fail("token was hashed"))
+    assert jmcp.token_id_from_file(_TOKEN + "x") is None
+    assert jmcp.token_id_from_file("") is None
+
+
+def test_raw_tokens_are_not_kept_in_the_index():
+    jmcp.token_id_from_file(_TOKEN)
+    assert _TOKEN not in jmcp._TOKENS_INDEX
+    assert all(len(key) == 32 for key in jmcp._TOKENS_INDEX)
+
+
+def test_entries_without_token_are_skipped(tokens):
+    tokens({"broken": {"description": "no token"}, "client": {"token": _TOKEN}})
+    assert jmcp.token_id_from_file(_TOKEN) == "client"
+    assert list(jmcp._TOKENS_INDEX.values()) == ["client"]
+
+
+def test_changed_file_is_reloaded_after_the_interval(clock, tokens):
+    assert jmcp.token_id_from_file(_TOKEN) == "client"
+    new_token = "jmcp_" + "n" * 40
+    tokens({"new": {"token": new_token}})
+
+    # Within the reload interval the previous index is still used
+    clock.now += jmcp._TOKENS_RELOAD_INTERVAL - 1
+    assert jmcp.token_id_from_file(_TOKEN) == "client"
+    assert jmcp.token_id_from_file(new_token) is None
+
+    clock.now += 1
+    assert jmcp.token_id_from_file(_TOKEN) is None
+    assert jmcp.token_id_from_file(new_token) == "new"
+
+
+def test_removed_file_revokes_every_token(clock):
+    assert jmcp.token_id_from_file(_TOKEN) == "client"
+    os.remove(".tokens")
+    clock.now += jmcp._TOKENS_RELOAD_INTERVAL
+    assert jmcp.token_id_from_file(_TOKEN) is None
+
+
+def test_invalid_file_yields_no_tokens():
+    with open(".tokens", "wb") as f:
+        f.write(b"{not json")
+    assert jmcp.token_id_from_file(_TOKEN) is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
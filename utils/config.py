@@ -1,11 +1,78 @@
 """
 Device configuration validation and connection parameter utilities
 """
+import functools
+import ipaddress
 import logging
-from typing import Dict, Any
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
+
+import fastjsonschema
 
 log = logging.getLogger('jmcp-server.config')
 
+# Auth type -> (credential field in the 'auth' section, Device keyword it is passed as)
+_AUTH_TABLE: Dict[str, tuple[str, str]] = {
+    'password': ('password', 'password'),
+    'ssh_key': ('private_key_path', 'ssh_private_key_file'),
+}
+_SUPPORTED_AUTH_TYPES = ", ".join(f"'{auth_type}'" for auth_type in _AUTH_TABLE)
+
+# Shape of one devices.json entry: either an 'auth' section or the deprecated
+# top-level 'password'
+_DEVICE_SCHEMA = {
+    "type": "object",
+    "required": ["ip", "port", "username"],
+    "properties": {
+        "ip": {"type": "string"},
+        "port": {"type": "integer", "minimum": 1, "maximum": 65535},
+        "username": {"type": "string"},
+        "auth": {
+            "type": "object",
+            "required": ["type"],
+            "oneOf": [
+                {"properties": {"type": {"const": auth_type}}, "required": [field]}
+                for auth_type, (field, _) in _AUTH_TABLE.items()
+            ],
+        },
+    },
+    "anyOf": [{"required": ["auth"]}, {"required": ["password"]}],
+}
+
+_REQUIRED_FIELDS = frozenset(_DEVICE_SCHEMA["required"])
+
+# Generated straight-line validator; built once at import
+_validate_device_schema = fastjsonschema.compile(_DEVICE_SCHEMA)
+
+# Host name: dot-separated labels of letters, digits, inner hyphens and underscores.
+# Underscores are not RFC 1123, but they are common in ssh_config aliases and internal names.
+_HOSTNAME_RE = re.compile(r'(?!-)[A-Za-z0-9_-]{1,63}(?<!-)(\.(?!-)[A-Za-z0-9_-]{1,63}(?<!-))*\.?')
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_valid_host(host: str) -> bool:
+    """Check that a device 'ip' is an IP address or a well-formed host name
+    
+    Host names are allowed so that names resolved through DNS or ssh_config keep working.
+    """
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        pass
+    # An all-numeric last label is a mistyped IPv4 address (e.g. 300.1.1.1), not a name
+    if len(host) > 253 or host.rstrip('.').rpartition('.')[2].isdigit():
+        return False
+    return _HOSTNAME_RE.fullmatch(host) is not None
+
+
+# id(config) -> config for the read-only copies returned by the latest validate_all_devices
+# call. Holding the copy keeps its id from being reused, and the copy itself cannot change,
+# so a hit can never be stale. Each call replaces the set, which bounds it to one fleet.
+_VALIDATED: Dict[int, Mapping[str, Any]] = {}
+
 
 def validate_device_config(device_name: str, device_config: Dict[str, Any]) -> None:
     """Validate device configuration has all required fields
@@ -17,89 +84,184 @@ def validate_device_config(device_name: str, device_config: Dict[str, Any]) -> N
     Raises:
         ValueError: If required fields are missing or invalid
     """
+    errors = _validate_device_errors(device_name, device_config)
+    if errors:
+        raise ValueError(f"Device '{device_name}' " + "; ".join(errors))
+
+
+def _validate_device_errors(device_name: str, device_config: Dict[str, Any]) -> List[str]:
+    """Validate a device configuration without raising
+    
+    Returns:
+        The problems found, each worded to follow "Device '<name>'"; empty if valid
+    """
+    if _VALIDATED.get(id(device_config)) is device_config:
+        return []
+    
+    if not isinstance(device_config, dict) and isinstance(device_config, Mapping):
+        # e.g. a frozen copy from an earlier validate_all_devices; the schema only accepts dicts
+        device_config = dict(device_config)
+        if isinstance(device_config.get('auth'), Mapping):
+            device_config['auth'] = dict(device_config['auth'])
+    
+    try:
+        _validate_device_schema(device_config)
+    except fastjsonschema.JsonSchemaException as e:
+        error = e.message
+    else:
+        # JSON Schema also counts 22.0 as an integer
+        if type(device_config['port']) is int and _is_valid_host(device_config['ip']):
+            log.debug("Device '%s' configuration validated successfully", device_name)
+            return []
+        error = "data.port must be integer and data.ip a valid address"
+    
+    # Only a failing config pays for the detailed checks that word the error
+    return _device_config_errors(device_config) or [f"has an invalid configuration: {error}"]
+
+
+def _device_config_errors(device_config: Dict[str, Any]) -> List[str]:
+    """Describe every problem with a config that failed _DEVICE_SCHEMA
+    
+    Returns an empty list if none of these checks applies; the caller then
+    reports the schema error itself.
+    """
+    if not isinstance(device_config, dict):
+        return [f"configuration must be an object, got {type(device_config).__name__}"]
+    
+    errors = []
+    
     # Check required top-level fields
-    required_fields = ['ip', 'port', 'username']
-    missing_fields = [field for field in required_fields if field not in device_config]
+    missing_fields = _REQUIRED_FIELDS.difference(device_config)
     
     if missing_fields:
-        raise ValueError(
-            f"Device '{device_name}' missing required fields: {', '.join(missing_fields)}. "
+        errors.append(
+            f"missing required fields: {', '.join(sorted(missing_fields))}. "
             f"Expected format: {{'ip': 'x.x.x.x', 'port': 22, 'username': 'user', 'auth': {{...}}}}"
         )
     
     # Validate authentication configuration
     if 'auth' in device_config:
         auth_config = device_config['auth']
-        if 'type' not in auth_config:
-            raise ValueError(
-                f"Device '{device_name}' has 'auth' section but missing 'type' field. "
-                f"Expected 'type' to be either 'password' or 'ssh_key'"
+        if not isinstance(auth_config, dict):
+            errors.append(f"has invalid 'auth' section. Expected object, got {type(auth_config).__name__}")
+        elif 'type' not in auth_config:
+            errors.append(
+                "has 'auth' section but missing 'type' field. "
+                f"Expected 'type' to be one of: {_SUPPORTED_AUTH_TYPES}"
             )
-        
-        if auth_config['type'] == 'password':
-            if 'password' not in auth_config:
-                raise ValueError(
-                    f"Device '{device_name}' auth type is 'password' but 'password' field is missing"
-                )
-        elif auth_config['type'] == 'ssh_key':
-            if 'private_key_path' not in auth_config:
-                raise ValueError(
-                    f"Device '{device_name}' auth type is 'ssh_key' but 'private_key_path' field is missing"
-                )
         else:
-            raise ValueError(
-                f"Device '{device_name}' has unsupported auth type '{auth_config['type']}'. "
-                f"Supported types are: 'password', 'ssh_key'"
-            )
+            auth_type = auth_config['type']
+            try:
+                credential_field, _ = _AUTH_TABLE[auth_type]
+            except (KeyError, TypeError):
+                errors.append(
+                    f"has unsupported auth type '{auth_type}'. "
+                    f"Supported types are: {_SUPPORTED_AUTH_TYPES}"
+                )
+            else:
+                if credential_field not in auth_config:
+                    errors.append(f"auth type is '{auth_type}' but '{credential_field}' field is missing")
     elif 'password' not in device_config:
         # No auth section and no password field (backward compatibility check)
-        raise ValueError(
-            f"Device '{device_name}' missing authentication configuration. "
-            f"Either provide 'auth' section or 'password' field (deprecated)"
+        errors.append(
+            "missing authentication configuration. "
+            "Either provide 'auth' section or 'password' field (deprecated)"
         )
     
-    # Validate data types
-    if not isinstance(device_config.get('port'), int):
-        raise ValueError(
-            f"Device '{device_name}' has invalid 'port' value. Expected integer, got {type(device_config.get('port')).__name__}"
-        )
+    # Validate data types (missing fields were reported above)
+    for field in ('ip', 'username'):
+        if field in device_config and not isinstance(device_config[field], str):
+            errors.append(f"has invalid '{field}' value. Expected string, got {type(device_config[field]).__name__}")
+    ip = device_config.get('ip')
+    if isinstance(ip, str) and not _is_valid_host(ip):
+        errors.append(f"has invalid 'ip' value '{ip}'. Expected an IP address or host name")
+    port = device_config.get('port')
+    # bool is an int subclass, but "port": true is not a port
+    if 'port' in device_config and (not isinstance(port, int) or isinstance(port, bool)):
+        errors.append(f"has invalid 'port' value. Expected integer, got {type(port).__name__}")
+    elif isinstance(port, int) and not 1 <= port <= 65535:
+        errors.append(f"has invalid 'port' value {port}. Expected 1-65535")
     
-    log.debug(f"Device '{device_name}' configuration validated successfully")
+    return errors
+
+
+def intern_device_names(devices: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Return devices keyed by interned names, interning auth types in place
+    
+    Router names and auth types are looked up on every tool call; interned keys
+    let those dict lookups match on identity.
+    """
+    for device_config in devices.values():
+        auth_config = device_config.get('auth') if isinstance(device_config, dict) else None
+        if isinstance(auth_config, dict) and isinstance(auth_config.get('type'), str):
+            auth_config['type'] = sys.intern(auth_config['type'])
+    return {sys.intern(name): device_config for name, device_config in devices.items()}
 
 
-def validate_all_devices(devices: Dict[str, Dict[str, Any]]) -> None:
+def validate_all_devices(devices: Dict[str, Dict[str, Any]]) -> Dict[str, Mapping[str, Any]]:
     """Validate all device configurations
     
     Args:
-        devices: Dictionary of device configurations
+        devices: Dictionary of device configurations (left unmodified)
+    
+    Returns:
+        A new mapping of device name to a read-only copy of its configuration
     
     Raises:
         ValueError: If any device configuration is invalid
     """
     if not devices:
         log.warning("No devices configured")
-        return
+        return {}
     
     errors = []
     for device_name, device_config in devices.items():
-        try:
-            validate_device_config(device_name, device_config)
-        except ValueError as e:
-            errors.append(str(e))
+        device_errors = _validate_device_errors(device_name, device_config)
+        if device_errors:
+            errors.append(f"Device '{device_name}' " + "; ".join(device_errors))
     
     if errors:
         error_msg = "Device configuration validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
         raise ValueError(error_msg)
     
-    log.info(f"All {len(devices)} device(s) validated successfully")
+    log.info("All %s device(s) validated successfully", len(devices))
+    frozen = {device_name: _freeze_device(device_config) for device_name, device_config in devices.items()}
+    _VALIDATED.clear()
+    _VALIDATED.update((id(device_config), device_config) for device_config in frozen.values())
+    return frozen
+
+
+def _freeze_device(device_config: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Return a read-only copy of a validated config
+    
+    Validation results (and the connection parameters built from them) are cached
+    per config object, which is only sound if nobody can edit a config afterwards.
+    The copy's dicts are reachable only through the views, so it cannot change.
+    """
+    if _VALIDATED.get(id(device_config)) is device_config:
+        return device_config
+    copy = dict(device_config)
+    if isinstance(copy.get('auth'), Mapping):
+        copy['auth'] = MappingProxyType(dict(copy['auth']))
+    return MappingProxyType(copy)
 
 
-def prepare_connection_params(device_info: Dict[str, Any], router_name: str) -> Dict[str, Any]:
+# Connection parameters shared by every device
+_CONNECT_DEFAULTS: Dict[str, Any] = {
+    'gather_facts': False,
+    'timeout': 360,  # Default timeout of 360 seconds
+    'auto_probe': 0  # Disable auto probe to bypass host key checking issues
+}
+
+
+def prepare_connection_params(device_info: Dict[str, Any], router_name: str, *,
+                              validated: bool = False) -> Dict[str, Any]:
     """Prepare connection parameters based on authentication type
     
     Args:
         device_info: Device configuration dictionary
         router_name: Name of the router (used for error messages)
+        validated: Skip validation because the caller already ran validate_all_devices
     
     Returns:
         Connection parameters for Junos Device
@@ -108,16 +270,30 @@ def prepare_connection_params(device_info: Dict[str, Any], router_name: str) ->
         ValueError: If authentication configuration is invalid
     """
     # Validate configuration first
-    validate_device_config(router_name, device_info)
+    if not validated:
+        validate_device_config(router_name, device_info)
+    return build_connection_params(device_info, router_name)
+
+
+def build_connection_params(device_info: Dict[str, Any], router_name: str) -> Dict[str, Any]:
+    """Build connection parameters for a device that has already been validated
     
+    Args:
+        device_info: Device configuration dictionary (see validate_device_config)
+        router_name: Name of the router (used for error messages)
+    
+    Returns:
+        Connection parameters for Junos Device
+    
+    Raises:
+        ValueError: If authentication configuration is invalid
+    """
     # Base connection parameters
     connect_params = {
         'host': device_info['ip'],
         'port': device_info['port'],
         'user': device_info['username'],
-        'gather_facts': False,
-        'timeout': 360,  # Default timeout of 360 seconds
-        'auto_probe': 0  # Disable auto probe to bypass host key checking issues
+        **_CONNECT_DEFAULTS
     }
     
     # Add SSH config file if specified
@@ -127,12 +303,11 @@ def prepare_connection_params(device_info: Dict[str, Any], router_name: str) ->
     # Handle different authentication methods
     if 'auth' in device_info:
         auth_config = device_info['auth']
-        if auth_config['type'] == 'password':
-            connect_params['password'] = auth_config['password']
-        elif auth_config['type'] == 'ssh_key':
-            connect_params['ssh_private_key_file'] = auth_config['private_key_path']
-        else:
-            raise ValueError(f"Unsupported auth type '{auth_config['type']}' for {router_name}")
+        try:
+            credential_field, param = _AUTH_TABLE[auth_config['type']]
+        except KeyError:
+            raise ValueError(f"Unsupported auth type '{auth_config['type']}' for {router_name}") from None
+        connect_params[param] = auth_config[credential_field]
     elif 'password' in device_info:
         # Backward compatibility with old format
         connect_params['password'] = device_info['password']
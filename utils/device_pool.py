@@ -0,0 +1,148 @@
+"""
+Persistent Junos device connection pool
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+from jnpr.junos import Device
+from jnpr.junos.exception import ConnectError
+
+log = logging.getLogger('jmcp-server.pool')
+
+
+class _PoolEntry:
+    """A pooled device handle with its own lock (PyEZ Device is not thread-safe)"""
+    __slots__ = ('device', 'lock', 'last_used')
+
+    def __init__(self):
+        self.device: Device | None = None
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class DevicePool:
+    """Keep one open NETCONF session per router and reuse it across tool calls
+
+    Sessions are opened lazily on first checkout, re-opened if they are found
+    disconnected, and closed once they have been idle for ``idle_timeout`` seconds.
+    Idle sessions are swept during checkout, at most every ``sweep_interval`` seconds.
+    A session idle for longer than ``health_check_after`` seconds is probed with a cheap
+    RPC before it is handed out, so silently dropped transports are replaced up front.
+    The probe waits at most ``probe_timeout`` seconds, whatever the session's own timeout.
+    """
+
+    def __init__(self, idle_timeout: float = 300, sweep_interval: float = 30, health_check_after: float = 30,
+                 probe_timeout: float = 5):
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.health_check_after = health_check_after
+        self.probe_timeout = probe_timeout
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def _get_entry(self, router_name: str) -> _PoolEntry:
+        with self._lock:
+            entry = self._entries.get(router_name)
+            if entry is None:
+                entry = self._entries[router_name] = _PoolEntry()
+            return entry
+
+    @staticmethod
+    def _close_device(router_name: str, entry: _PoolEntry) -> None:
+        """Close the entry's device, ignoring errors from an already broken transport"""
+        device, entry.device = entry.device, None
+        if device is None:
+            return
+        try:
+            if device.connected:
+                log.debug("Closing pooled connection to %s", router_name)
+                device.close()
+        except Exception as e:
+            log.warning("Error while closing pooled connection to %s: %s", router_name, e)
+
+    def _is_alive(self, router_name: str, device: Device) -> bool:
+        """Probe a pooled session with a lightweight RPC under a short timeout
+        
+        The session timeout (360 s by default, or whatever the last caller set) would
+        otherwise let a black-holed transport stall the checkout with the entry locked.
+        """
+        saved_timeout = device.timeout
+        try:
+            device.timeout = self.probe_timeout
+            device.rpc.get_system_uptime_information()
+            return True
+        except Exception as e:
+            log.debug("Pooled connection to %s failed its health check: %s", router_name, e)
+            return False
+        finally:
+            try:
+                device.timeout = saved_timeout
+            except Exception:
+                # A dead session is closed by the caller; its timeout no longer matters
+                pass
+
+    def close_idle(self) -> None:
+        """Close sessions that have not been used for longer than idle_timeout"""
+        now = time.monotonic()
+        cutoff = now - self.idle_timeout
+        with self._lock:
+            self._next_sweep = now + self.sweep_interval
+            entries = list(self._entries.items())
+        for router_name, entry in entries:
+            if entry.device is None or entry.last_used > cutoff:
+                continue
+            # Skip entries that are currently checked out
+            if entry.lock.acquire(blocking=False):
+                try:
+                    if entry.last_used <= cutoff:
+                        self._close_device(router_name, entry)
+                finally:
+                    entry.lock.release()
+
+    def close_all(self) -> None:
+        """Close every pooled session (used on shutdown)"""
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        for router_name, entry in entries:
+            self._close_device(router_name, entry)
+
+    @contextmanager
+    def checkout(self, router_name: str, connect_params: Dict[str, Any]) -> Iterator[Device]:
+        """Borrow an open Device for router_name, opening a new session if needed
+
+        Args:
+            router_name: Name of the router (pool key)
+            connect_params: Parameters used to open a new Device when no live session exists
+
+        Raises:
+            ConnectError: If a new session cannot be opened
+        """
+        # Sweeping walks every entry, so only do it every sweep_interval seconds
+        if time.monotonic() >= self._next_sweep:
+            self.close_idle()
+        entry = self._get_entry(router_name)
+        with entry.lock:
+            if (entry.device is not None and entry.device.connected
+                    and time.monotonic() - entry.last_used > self.health_check_after
+                    and not self._is_alive(router_name, entry.device)):
+                self._close_device(router_name, entry)
+            if entry.device is None or not entry.device.connected:
+                log.debug("Opening pooled connection to %s", router_name)
+                entry.device = None
+                device = Device(**connect_params)
+                device.open()
+                entry.device = device
+            try:
+                yield entry.device
+            except Exception as e:
+                # Drop sessions whose transport is gone so the next checkout reconnects
+                if isinstance(e, ConnectError) or not entry.device.connected:
+                    self._close_device(router_name, entry)
+                raise
+            finally:
+                entry.last_used = time.monotonic()